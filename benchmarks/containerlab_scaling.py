@@ -0,0 +1,189 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from infrahub.transforms.containerlab import (
+    CLAB_BASE_DATA,
+    CLAB_SCHEMA_COMMENT,
+    TransformContainerlabTopology,
+)
+from infrahub.transforms.Modules.clabwriter import ClabLink, ClabNode, ClabYAMLWriter
+from infrahub.transforms.Modules.topologygraph import TopologyGraph
+
+"""
+Scaling benchmark of TransformContainerlabTopology on in-memory fabrics.
+
+- Devices are plain objects with the attributes the transform reads,
+  no Infrahub instance is needed.
+- Run from the repository root with custom_helper installed
+  (pip install -e setup/infrahub-worker):
+  python -m benchmarks.containerlab_scaling
+"""
+
+SPINES = 16
+LINK_COUNTS = (1_000, 10_000)
+NODE_COUNTS = (1_000, 10_000)
+REPEAT = 3
+# Node data with every value type containerlab files use
+TYPED_NODE_DATA = {
+    "kind": "linux",
+    "mtu": 9000,
+    "startup-delay": 1.5,
+    "auto-remove": True,
+    "enforce-startup-config": False,
+    "network-mode": None,
+    "ports": ["8080:80", 50051],
+    "binds": [],
+    "env": {},
+    "exec": ["ip link set eth1 up", {"cmd": ["a", None, [1, [2.0]]]}],
+    "labels": {"graph-level": 2, "graph-icon": "switch", "empty": None},
+}
+
+
+def _value(value):
+    return SimpleNamespace(value=value)
+
+
+def _device(name: str):
+    return SimpleNamespace(
+        name=_value(name),
+        platform=_value("nokia_srlinux"),
+        description=_value(f"{name} description"),
+        interfaces=SimpleNamespace(peers=[]),
+    )
+
+
+def _connect(device_1, name_1: str, device_2, name_2: str, subnet: int) -> None:
+    network = f"10.{subnet // 256}.{subnet % 256}"
+    interface_1 = SimpleNamespace(
+        name=_value(name_1),
+        device=SimpleNamespace(peer=device_1),
+        ip_address=SimpleNamespace(id=f"ip{subnet}a", display_label=f"{network}.0/31"),
+    )
+    interface_2 = SimpleNamespace(
+        name=_value(name_2),
+        device=SimpleNamespace(peer=device_2),
+        ip_address=SimpleNamespace(id=f"ip{subnet}b", display_label=f"{network}.1/31"),
+    )
+    interface_1.remote_interface = SimpleNamespace(id="remote", peer=interface_2)
+    interface_2.remote_interface = SimpleNamespace(id="remote", peer=interface_1)
+    device_1.interfaces.peers.append(SimpleNamespace(peer=interface_1))
+    device_2.interfaces.peers.append(SimpleNamespace(peer=interface_2))
+
+
+def leaf_spine(links: int) -> list:
+    """Leaves with one uplink to each of the SPINES spines."""
+    spines = [_device(f"spine{s:02d}") for s in range(SPINES)]
+    leaves = [_device(f"leaf{n:05d}") for n in range(-(-links // SPINES))]
+    for n in range(links):
+        leaf, spine = divmod(n, SPINES)
+        _connect(
+            leaves[leaf],
+            f"ethernet-1/{spine + 1}",
+            spines[spine],
+            f"ethernet-1/{leaf + 1}",
+            n,
+        )
+    return spines + leaves
+
+
+def ring(nodes: int) -> list:
+    """Devices connected in a ring, as many links as nodes."""
+    devices = [_device(f"leaf{n:05d}") for n in range(nodes)]
+    for n, device in enumerate(devices):
+        _connect(device, "ethernet-1/1", devices[(n + 1) % nodes], "ethernet-1/2", n)
+    return devices
+
+
+class BenchmarkTransform(TransformContainerlabTopology):
+    """Transform over in-memory devices, without an Infrahub client."""
+
+    def __init__(self, devices: list) -> None:
+        self._nodes = devices
+
+    async def fetch(self):
+        pass
+
+
+def _best(run, *args) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        run(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def collect_links(devices: list) -> None:
+    graph: TopologyGraph[ClabNode] = TopologyGraph()
+    for device in devices:
+        graph.add_device(device.name.value, ClabNode(device.name.value, {}))
+        for _ in BenchmarkTransform.get_links(device, graph):
+            pass
+
+
+def run_transform(transform: BenchmarkTransform) -> str:
+    return asyncio.run(transform.transform(None))
+
+
+def link_scaling():
+    """Print the link collection and full transform time per fabric size."""
+    print(
+        f"{'links':>7} {'devices':>8} {'get_links':>11} {'transform':>11} {'us/link':>8}"
+    )
+    for links in LINK_COUNTS:
+        devices = leaf_spine(links)
+        transform = BenchmarkTransform(devices)
+        output = run_transform(transform)
+        # Both ends report every link, each one has to be emitted once
+        assert output.count("- endpoints:") == links
+        collect = _best(collect_links, devices)
+        total = _best(run_transform, transform)
+        print(
+            f"{links:>7} {len(devices):>8} {collect * 1e3:>8.1f} ms"
+            f" {total * 1e3:>8.1f} ms {total / links * 1e6:>8.1f}"
+        )
+
+
+def emitter_scaling():
+    """Print the transform time of each YAML emitter per ring size."""
+    print(f"{'nodes':>7} {'direct':>11} {'ruamel':>11}")
+    for nodes in NODE_COUNTS:
+        timings = {}
+        outputs = {}
+        for emitter in ("direct", "ruamel"):
+            transform = BenchmarkTransform(ring(nodes))
+            transform.yaml_emitter = emitter
+            outputs[emitter] = run_transform(transform)
+            timings[emitter] = _best(run_transform, transform)
+        # Both emitters write the same text
+        assert outputs["direct"] == outputs["ruamel"]
+        print(
+            f"{nodes:>7} {timings['direct'] * 1e3:>8.1f} ms"
+            f" {timings['ruamel'] * 1e3:>8.1f} ms"
+        )
+
+
+def emitter_parity():
+    """Check that both emitters write the same text for typed node data."""
+    nodes = [
+        ClabNode("host01", TYPED_NODE_DATA, "typed values"),
+        ClabNode("host02", {"ports": [22]}),
+    ]
+    links = [ClabLink("host01:eth1", "10.0.0.0/31", "host02:eth1", None)]
+    direct = ClabYAMLWriter.dump(CLAB_BASE_DATA, nodes, links, CLAB_SCHEMA_COMMENT)
+    assert direct == TransformContainerlabTopology.dump_ruamel(
+        CLAB_BASE_DATA, nodes, links
+    )
+
+
+def main():
+    """Run both benchmarks, the ruamel emitter at 10k nodes takes a while."""
+    emitter_parity()
+    link_scaling()
+    print()
+    emitter_scaling()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import time
+import tracemalloc
+import xml.etree.ElementTree as ETree  # nosec B405
+from copy import deepcopy
+from xml.dom.minidom import parseString  # nosec B408
+
+from lxml import etree  # nosec B410
+
+from infrahub.transforms.Modules.xmlexporter import XMLModelConverter
+
+from .xml_namespace import BenchmarkTransform, device_response
+
+"""
+Latency and memory benchmark of the TransformIntoNetconf output stage.
+
+- Compares serialize() in every output_format with the previous
+  ElementTree.tostring + minidom toprettyxml round trip, per device.
+- Run from the repository root with custom_helper installed
+  (pip install -e setup/infrahub-worker):
+  python -m benchmarks.netconf_output
+"""
+
+DEVICES = ((48, 100), (5000, 500))
+MODES = ("pretty", "compact", "c14n")
+REPEAT = 20
+
+
+def minidom(xmlcontent: etree.Element) -> str:
+    """The previous output stage."""
+    ETree.register_namespace("nc", "urn:ietf:params:xml:ns:netconf:base:1.0")
+    xml_string = ETree.tostring(xmlcontent, encoding="unicode")
+    return parseString(xml_string).toprettyxml()  # nosec B318
+
+
+def serializer(mode: str):
+    transform = BenchmarkTransform()
+    transform.output_format = mode
+    return transform.serialize
+
+
+def measure(serialize, tree: etree.Element) -> tuple[float, int, str]:
+    """Best time and tracemalloc peak of serialize, each run on a fresh tree."""
+    timings = []
+    for _ in range(REPEAT):
+        # pretty indents the tree in place
+        xmlcontent = deepcopy(tree)
+        start = time.perf_counter()
+        serialize(xmlcontent)
+        timings.append(time.perf_counter() - start)
+    xmlcontent = deepcopy(tree)
+    tracemalloc.start()
+    output = serialize(xmlcontent)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak, output
+
+
+def main():
+    """Print the time, peak memory and size of every output stage per device."""
+    for interfaces, vlans in DEVICES:
+        model = BenchmarkTransform().build_model(device_response(interfaces, vlans))
+        tree = XMLModelConverter.to_xml(model)
+        print(f"{interfaces} interfaces / {vlans} VLANs")
+        print(f"  {'stage':<8} {'time':>10} {'peak':>11} {'size':>11}")
+        outputs = {}
+        for stage, serialize in [("minidom", minidom)] + [
+            (mode, serializer(mode)) for mode in MODES
+        ]:
+            elapsed, peak, outputs[stage] = measure(serialize, tree)
+            print(
+                f"  {stage:<8} {elapsed * 1e3:>7.2f} ms {peak / 1024:>7.0f} KiB"
+                f" {len(outputs[stage]) / 1024:>7.0f} KiB"
+            )
+        # The pretty artifact is the one the minidom round trip produced
+        assert outputs["pretty"] == outputs["minidom"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import importlib.util
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+
+"""
+Import and validation benchmark of the generated PydanticStructure models.
+
+- Every given out.py is loaded as a fresh module, the loads alternate
+  between the files so they see the same interpreter state.
+- Run from the repository root, optionally against other versions of the
+  file, e.g. one exported with git show:
+  python -m benchmarks.pydantic_structure [path/to/out.py ...]
+"""
+
+OUT_PY = (
+    Path(__file__).resolve().parent.parent
+    / "infrahub"
+    / "transforms"
+    / "PydanticStructure"
+    / "out.py"
+)
+ROUNDS = 30
+VALIDATIONS = 10_000
+VLAN_ENTRY = {
+    "openconfig-vlan:vlan-id": 10,
+    "openconfig-vlan:config": {
+        "openconfig-vlan:vlan-id": 10,
+        "openconfig-vlan:name": "vlan10",
+    },
+}
+
+
+def load(path: Path, name: str):
+    """Create all models of path as the module name, return it with the load time."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Pydantic resolves the postponed annotations through sys.modules
+    sys.modules[name] = module
+    start = time.perf_counter()
+    spec.loader.exec_module(module)
+    elapsed = time.perf_counter() - start
+    del sys.modules[name]
+    return module, elapsed
+
+
+def main():
+    """Print the median load time and VlanListEntry2 validation time per file."""
+    paths = [Path(arg) for arg in sys.argv[1:]] or [OUT_PY]
+    loads: dict[Path, list[float]] = {path: [] for path in paths}
+    validations: dict[Path, list[float]] = {path: [] for path in paths}
+    for n in range(ROUNDS):
+        for i, path in enumerate(paths):
+            module, elapsed = load(path, f"_benchmark_out_{n}_{i}")
+            loads[path].append(elapsed)
+            validate = timeit.Timer(
+                "model.model_validate(entry)",
+                globals={"model": module.VlanListEntry2, "entry": VLAN_ENTRY},
+            )
+            validations[path].append(validate.timeit(VALIDATIONS) / VALIDATIONS)
+    print(f"{'load':>9} {'validate':>10}  file")
+    for path in paths:
+        print(
+            f"{statistics.median(loads[path]) * 1e3:>6.1f} ms"
+            f" {statistics.median(validations[path]) * 1e6:>7.2f} us  {path}"
+        )
+
+
+if __name__ == "__main__":
+    main()
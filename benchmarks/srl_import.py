@@ -0,0 +1,54 @@
+import statistics
+import subprocess
+import sys
+
+"""
+Cold-start import benchmark of custom_helper and the SRL models.
+
+- Every statement runs in a fresh interpreter, as in a new worker process.
+- Needs custom_helper and pydantic_srlinux installed
+  (pip install -e setup/infrahub-worker), run from the repository root:
+  python -m benchmarks.srl_import
+"""
+
+RUNS = 15
+STATEMENTS = {
+    "import custom_helper": "import custom_helper",
+    "import custom_helper.protocols": "import custom_helper.protocols",
+    "import custom_helper.srl_netconf": "import custom_helper.srl_netconf",
+    "... plus building one interface entry": (
+        "import custom_helper.srl_netconf as srl; srl.fabric_subinterface()"
+    ),
+    # The cost every import of srl_netconf paid before the lazy loading
+    "import the SRL model modules": (
+        "import pydantic_srlinux.models.interfaces,"
+        " pydantic_srlinux.models.network_instance"
+    ),
+}
+TIMER = (
+    "import time; start = time.perf_counter(); {}; print(time.perf_counter() - start)"
+)
+
+
+def coldstart(statement: str) -> float:
+    """Median time of statement in RUNS fresh interpreters."""
+    timings = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", TIMER.format(statement)],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        timings.append(float(result.stdout.splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    """Print the median cold-start time of every statement."""
+    for label, statement in STATEMENTS.items():
+        print(f"{coldstart(statement) * 1e3:>8.1f} ms  {label}")
+
+
+if __name__ == "__main__":
+    main()
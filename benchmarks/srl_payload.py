@@ -0,0 +1,96 @@
+import asyncio
+import ipaddress
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from custom_helper import srl_netconf
+
+"""
+Latency, peak memory and size benchmark of the SRL payload output modes.
+
+- The device is an in-memory object with routed, access, trunk and fabric
+  interfaces, no Infrahub instance is needed.
+- Needs custom_helper and pydantic_srlinux installed
+  (pip install -e setup/infrahub-worker), run from the repository root:
+  python -m benchmarks.srl_payload
+"""
+
+INTERFACES = 2000
+TRUNK_VLANS = range(100, 140)
+MODES = ("routed", "access", "trunk", "fabric")
+
+
+def _value(value):
+    return SimpleNamespace(value=value)
+
+
+def device(interfaces: int):
+    peers = []
+    for n in range(interfaces):
+        mode = MODES[n % len(MODES)]
+        vlans = [10 + n % 50] if mode == "access" else TRUNK_VLANS
+        interface = SimpleNamespace(
+            name=_value(f"ethernet-1/{n + 1}"),
+            description=_value(f"interface {n + 1}"),
+            status=_value("up"),
+            mode=_value(mode),
+            ip_address=SimpleNamespace(
+                peer=SimpleNamespace(
+                    address=_value(
+                        ipaddress.ip_interface(f"10.{n // 256}.{n % 256}.0/31")
+                    )
+                )
+            ),
+            vlan=SimpleNamespace(
+                peers=[
+                    SimpleNamespace(peer=SimpleNamespace(vlan_id=_value(vlan)))
+                    for vlan in vlans
+                ]
+            ),
+        )
+        peers.append(SimpleNamespace(peer=interface))
+    return SimpleNamespace(interfaces=SimpleNamespace(peers=peers))
+
+
+async def render(device, mode: str) -> str:
+    if mode != "stream":
+        return await srl_netconf.main(device, mode)
+    return "".join([chunk async for chunk in srl_netconf.iter_payload(device)])
+
+
+async def drain(device, mode: str) -> None:
+    if mode != "stream":
+        await srl_netconf.main(device, mode)
+        return
+    # Chunks are dropped as they arrive, as when written to a stream
+    async for _ in srl_netconf.iter_payload(device):
+        pass
+
+
+def main():
+    """Print the time, peak memory and size of every output mode."""
+    benchmarkdevice = device(INTERFACES)
+    outputs = {
+        mode: asyncio.run(render(benchmarkdevice, mode))
+        for mode in ("pretty", "compact", "stream")
+    }
+    # The streamed chunks join into the compact payload
+    assert outputs["stream"] == outputs["compact"]
+    print(f"{'mode':<8} {'time':>10} {'peak':>10} {'size':>10}")
+    for mode, output in outputs.items():
+        start = time.perf_counter()
+        asyncio.run(drain(benchmarkdevice, mode))
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        asyncio.run(drain(benchmarkdevice, mode))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f"{mode:<8} {elapsed * 1e3:>7.1f} ms {peak / 1e6:>7.1f} MB"
+            f" {len(output) / 1e6:>7.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import time
+from contextlib import contextmanager
+from typing import Any
+
+from lxml import etree  # nosec B410
+from pydantic import BaseModel, ConfigDict, Field, RootModel, create_model
+
+from infrahub.transforms.Modules.xmlexporter import FieldPlan, XMLModelConverter
+from infrahub.transforms.transform import TransformIntoNetconf
+
+"""
+Benchmark of the xmlns decision in XMLModelConverter.to_xml.
+
+- Compares the namespace scope passed down the recursion with the previous
+  walk up the ancestors of every new element, on the same compiled plans.
+- Run from the repository root with custom_helper installed
+  (pip install -e setup/infrahub-worker):
+  python -m benchmarks.xml_namespace
+"""
+
+INTERFACES = 5000
+VLANS = 500
+DEPTHS = (8, 32, 128)
+WIDTH = 8
+REPEAT = 5
+# Like the generated models, fields are set by name and aliased to XML tags
+MODEL_CONFIG = ConfigDict(populate_by_name=True)
+SPEEDS = (
+    "GigabitEthernet",
+    "TenGigabitEthernet",
+    "TwentyFiveGigE",
+    "FortyGigabitEthernet",
+)
+
+
+def device_response(interfaces: int, vlans: int) -> dict[str, Any]:
+    """GetInterfacefromDevice response of a switch with access, trunk and routed ports."""
+    edges = []
+    for n in range(interfaces):
+        mode = ("access", "trunk", "routed")[n % 3]
+        vlanids = {"access": [n % vlans + 1], "trunk": range(1, 11), "routed": []}
+        edges.append(
+            {
+                "node": {
+                    "name": {"value": f"{SPEEDS[n % len(SPEEDS)]}1/0/{n}"},
+                    "description": {"value": f"interface {n}"},
+                    "mode": {"value": mode},
+                    "status": {"value": "up"},
+                    "vlan": {
+                        "edges": [
+                            {"node": {"vlan_id": {"value": vlan}}}
+                            for vlan in vlanids[mode]
+                        ]
+                    },
+                    "ip_address": {"node": None},
+                }
+            }
+        )
+    return {
+        "NetworkDevice": {
+            "edges": [
+                {"node": {"name": {"value": "sw01"}, "interfaces": {"edges": edges}}}
+            ]
+        },
+        "NetworkVlan": {
+            "edges": [
+                {"node": {"name": {"value": f"vlan{n}"}, "vlan_id": {"value": n}}}
+                for n in range(1, vlans + 1)
+            ]
+        },
+    }
+
+
+class BenchmarkTransform(TransformIntoNetconf):
+    """Transform without an Infrahub client."""
+
+    def __init__(self) -> None:
+        pass
+
+
+class ValueLeaf(RootModel[int]):
+    pass
+
+
+def deep_tree(depth: int) -> BaseModel:
+    """A chain of depth nested containers with WIDTH leaves each."""
+    leaves = {
+        f"leaf{n}": (ValueLeaf | None, Field(None, alias=f"openconfig-deep:leaf{n}"))
+        for n in range(WIDTH)
+    }
+    model: BaseModel | None = None
+    for level in range(depth):
+        modelclass = create_model(
+            f"Level{level}",
+            __config__=MODEL_CONFIG,
+            child=(
+                type(model) | None,
+                Field(None, alias="openconfig-deep:child"),
+            ),
+            **leaves,
+        )
+        model = modelclass(child=model, **{name: ValueLeaf(level) for name in leaves})
+    return create_model(
+        "Root",
+        __config__=MODEL_CONFIG,
+        root=(type(model), Field(None, alias="openconfig-deep:root")),
+    )(root=model)
+
+
+def _ancestorwalk(
+    roottree: etree.Element, fieldplan: FieldPlan, namespace: str
+) -> etree.Element:
+    # The previous implementation, namespace in scope is ignored
+    element = roottree
+    while element is not None:
+        if element.attrib.get("xmlns") == fieldplan.namespace:
+            return etree.SubElement(roottree, fieldplan.tag)
+        element = element.getparent()
+    return etree.SubElement(
+        roottree, fieldplan.tag, attrib={"xmlns": fieldplan.namespace}
+    )
+
+
+@contextmanager
+def ancestorwalk():
+    """Render with the ancestor walk instead of the namespace scope."""
+    scope = XMLModelConverter.__dict__["_createsubelement"]
+    XMLModelConverter._createsubelement = staticmethod(_ancestorwalk)
+    try:
+        yield
+    finally:
+        XMLModelConverter._createsubelement = scope
+
+
+def _best(model: BaseModel) -> tuple[float, bytes]:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        tree = XMLModelConverter.to_xml(model)
+        timings.append(time.perf_counter() - start)
+    return min(timings), etree.tostring(tree)
+
+
+def compare(label: str, model: BaseModel) -> None:
+    with ancestorwalk():
+        before, expected = _best(model)
+    after, output = _best(model)
+    # Both decisions emit the same xmlns attributes
+    assert output == expected
+    print(f"{label:<28} {before * 1e3:>9.1f} ms {after * 1e3:>9.1f} ms")
+
+
+def main():
+    """Print the to_xml time with the ancestor walk and the namespace scope."""
+    print(f"{'model':<28} {'ancestors':>12} {'scope':>12}")
+    compare(
+        f"device {INTERFACES} if / {VLANS} vlans",
+        BenchmarkTransform().build_model(device_response(INTERFACES, VLANS)),
+    )
+    for depth in DEPTHS:
+        compare(f"depth {depth} x {WIDTH} leaves", deep_tree(depth))
+
+
+if __name__ == "__main__":
+    main()
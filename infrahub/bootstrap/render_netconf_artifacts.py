@@ -0,0 +1,62 @@
+import logging
+import sys
+from pathlib import Path
+
+from infrahub_sdk import InfrahubClient
+from infrahub_sdk.node import InfrahubNode
+from custom_helper.protocols import NetworkDevice
+
+"""
+Render the Netconf XML of many devices with one paginated query.
+
+infrahubctl run infrahub/bootstrap/render_netconf_artifacts.py \
+    devices=leaf01,leaf02 output=artifacts
+"""
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[2]
+
+
+async def run(
+    client: InfrahubClient,
+    log: logging.Logger,
+    branch: str,
+    devices: str = "",
+    output: str = "artifacts",
+    page_size: str = "100",
+    vlan_scope: str = "all",
+    output_format: str = "pretty",
+) -> None:
+    # infrahubctl only puts the directory of this script on the path
+    if str(REPOSITORY_ROOT) not in sys.path:
+        sys.path.append(str(REPOSITORY_ROOT))
+    from infrahub.transforms.transform import (
+        TransformIntoNetconf,
+        TransformIntoNetconfDeviceVlans,
+    )
+
+    branch = branch or client.default_branch
+    match vlan_scope:
+        case "all":
+            transformclass = TransformIntoNetconf
+        case "device":
+            transformclass = TransformIntoNetconfDeviceVlans
+        case _:
+            raise ValueError(f"Unknown VLAN scope '{vlan_scope}'.")
+    transform = transformclass(client=client, infrahub_node=InfrahubNode, branch=branch)
+    transform.output_format = output_format
+
+    devicenames = [name for name in devices.split(",") if name]
+    if not devicenames:
+        devicenames = [
+            device.name.value
+            for device in await client.all(kind=NetworkDevice, branch=branch)
+        ]
+    log.info(f"Rendering {len(devicenames)} devices on branch {branch}")
+
+    artifacts = await transform.transform_batch(devicenames, int(page_size))
+
+    directory = Path(output)
+    directory.mkdir(parents=True, exist_ok=True)
+    for devicename, artifact in artifacts.items():
+        (directory / f"{devicename}.xml").write_text(artifact, encoding="utf-8")
+    log.info(f"Wrote {len(artifacts)} artifacts to {directory}")
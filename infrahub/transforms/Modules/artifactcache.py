@@ -0,0 +1,166 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+import custom_helper
+
+"""
+Python Module to cache transform artifacts on disk.
+
+- Key: canonical hash of the query response, the transform and its source code.
+- Store: one file per artifact, evicted least recently used above a size limit.
+"""
+
+CACHE_DIR_ENV = "ARTIFACT_CACHE_DIR"
+CACHE_MAX_BYTES_ENV = "ARTIFACT_CACHE_MAX_BYTES"
+CACHE_MAX_BYTES_DEFAULT = 256 * 1024 * 1024
+# An eviction pass trims the cache to this share of the limit, so the next
+# writes do not trigger another directory scan right away
+CACHE_EVICT_TO = 0.9
+CACHE_SOURCES = [
+    Path(__file__).resolve().parent.parent,
+    Path(custom_helper.__file__).resolve().parent,
+]
+
+
+class ArtifactCache:
+    """Class ArtifactCache."""
+
+    _sourcedigests: Dict[str, str] = {}
+    # Running size of each cache directory written by this process
+    _sizes: Dict[str, int] = {}
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> ArtifactCache | None:
+        """Public Method to create the cache configured by the environment, None if disabled."""
+        max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV, CACHE_MAX_BYTES_DEFAULT))
+        if max_bytes <= 0:
+            return None
+        directory = os.environ.get(CACHE_DIR_ENV) or os.path.join(
+            tempfile.gettempdir(), "infrahub-artifact-cache"
+        )
+        return cls(Path(directory), max_bytes)
+
+    @staticmethod
+    def _sourcedigest(*directories: Path) -> str:
+        # Any change to the transform code invalidates its artifacts
+        cachekey = os.pathsep.join(str(directory) for directory in directories)
+        digest = ArtifactCache._sourcedigests.get(cachekey)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=16)
+            for directory in directories:
+                for path in sorted(directory.rglob("*.py")):
+                    h.update(str(path.relative_to(directory)).encode())
+                    h.update(path.read_bytes())
+            digest = h.hexdigest()
+            ArtifactCache._sourcedigests[cachekey] = digest
+        return digest
+
+    @staticmethod
+    def key(transform: str, version: str, sources: list[Path], data: Any) -> str:
+        """Public Method to compute the cache key of a transform run."""
+        h = hashlib.blake2b(digest_size=32)
+        h.update(f"{transform}\0{version}\0".encode())
+        h.update(ArtifactCache._sourcedigest(*sources).encode())
+        h.update(
+            json.dumps(
+                data, sort_keys=True, separators=(",", ":"), default=str
+            ).encode()
+        )
+        return h.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Public Method to read an artifact, None if it is not cached."""
+        path = self.directory / key
+        try:
+            content = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            # The modification time is the recency for the LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since the read, the content is valid
+            pass
+        return content
+
+    def put(self, key: str, content: str) -> None:
+        """Public Method to store an artifact and evict the least recently used ones."""
+        path = self.directory / key
+        cachekey = str(self.directory)
+        if cachekey not in ArtifactCache._sizes:
+            # Scan the directory once per process, then keep a running size
+            ArtifactCache._sizes[cachekey] = sum(size for _, size, _ in self._scan())
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        temppath = path.with_suffix(f".{os.getpid()}.tmp")
+        temppath.write_text(content, encoding="utf-8")
+        os.replace(temppath, path)
+        ArtifactCache._sizes[cachekey] += path.stat().st_size - replaced
+        if ArtifactCache._sizes[cachekey] > self.max_bytes:
+            self._evict()
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        # The running size misses writes of other processes, the scan is exact
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * CACHE_EVICT_TO)
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        ArtifactCache._sizes[str(self.directory)] = total
+
+
+class CachedTransformMixin:
+    """Mixin for InfrahubTransform classes to reuse the artifact of an unchanged query response.
+
+    Bump cache_version when the output changes without a change to the code
+    in this directory or in custom_helper.
+    """
+
+    cache_version = "1"
+
+    async def run(self, data: dict | None = None) -> Any:
+        cache = ArtifactCache.from_env()
+        if cache is None:
+            return await super().run(data=data)  # type: ignore[misc]
+        if not data:
+            data = await self.collect_data()  # type: ignore[attr-defined]
+        key = ArtifactCache.key(
+            f"{type(self).__module__}.{type(self).__qualname__}",
+            self.cache_version,
+            CACHE_SOURCES,
+            data.get("data") or data,
+        )
+        content = cache.get(key)
+        if content is not None:
+            return content
+        content = await super().run(data=data)  # type: ignore[misc]
+        if isinstance(content, str):
+            cache.put(key, content)
+        return content
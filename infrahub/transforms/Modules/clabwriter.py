@@ -0,0 +1,222 @@
+from functools import lru_cache
+from typing import Any, NamedTuple
+import json
+import re
+
+from ruamel.yaml import YAML
+from ruamel.yaml.compat import StringIO
+
+"""
+Python Module to write containerlab topology files without building a
+ruamel round-trip document.
+
+- Produces the same text as the ruamel dump of TransformContainerlabTopology.
+- Every node and link is written once, generation is linear in their number.
+"""
+
+# Scalars that ruamel writes without quotes and that do not resolve to a
+# bool, null or number
+PLAIN_SCALAR = re.compile(r"[A-Za-z_][\w./@+-]*(?::[\w./@+-]+)*")
+RESERVED_SCALARS = frozenset({"true", "false", "null"})
+
+
+class ClabNode(NamedTuple):
+    """A containerlab node with the description written as comment."""
+
+    name: str
+    data: dict[str, Any]
+    comment: str | None = None
+
+
+class ClabLink(NamedTuple):
+    """A containerlab link, the comments are written behind each endpoint."""
+
+    endpoint_1: str
+    comment_1: str | None
+    endpoint_2: str
+    comment_2: str | None
+    node_1: str = ""
+    node_2: str = ""
+
+
+class ClabYAMLWriter:
+    """Class ClabYAMLWriter."""
+
+    @staticmethod
+    @lru_cache(maxsize=1024, typed=True)
+    def _ruamelscalar(value: str | float) -> str:
+        stream = StringIO()
+        YAML().dump(value, stream)
+        text = stream.getvalue().removesuffix("...\n").rstrip("\n")
+        # A JSON string is a valid double quoted YAML scalar on a single line
+        return text if "\n" not in text else json.dumps(value)
+
+    @staticmethod
+    def _scalar(value: Any) -> str:
+        """Return the YAML text of a scalar, empty for None as ruamel writes it."""
+        match value:
+            case str():
+                if (
+                    PLAIN_SCALAR.fullmatch(value)
+                    and value.lower() not in RESERVED_SCALARS
+                ):
+                    return value
+                return ClabYAMLWriter._ruamelscalar(value)
+            case None:
+                return ""
+            case bool():
+                return "true" if value else "false"
+            case int():
+                return str(int(value))
+            case float():
+                return ClabYAMLWriter._ruamelscalar(float(value))
+            case _:
+                raise TypeError(f"Cannot write {type(value).__name__} values as YAML.")
+
+    @staticmethod
+    def _comment(comment: str | None, spacing: str = "  ") -> str:
+        if not comment:
+            return ""
+        return f"{spacing}# {' '.join(comment.splitlines())}"
+
+    @staticmethod
+    def _item(
+        lines: list[str], prefix: str, value: Any, indent: str, inline: bool = False
+    ) -> None:
+        """Write value behind prefix, block collections continue below indent.
+
+        Sequence entries are inline, their block collection starts on the
+        prefix line.
+        """
+        match value:
+            case dict() if value and inline:
+                ClabYAMLWriter._mapping(lines, value, indent + "  ", prefix + " ")
+            case dict() if value:
+                lines.append(prefix)
+                ClabYAMLWriter._mapping(lines, value, indent + "  ")
+            case list() if value and inline:
+                ClabYAMLWriter._sequence(lines, value, indent + "  ", prefix + "   ")
+            case list() if value:
+                lines.append(prefix)
+                ClabYAMLWriter._sequence(lines, value, indent)
+            case dict():
+                lines.append(f"{prefix} {{}}")
+            case list():
+                lines.append(f"{prefix} []")
+            case None if not inline:
+                lines.append(prefix)
+            case _:
+                lines.append(f"{prefix} {ClabYAMLWriter._scalar(value)}")
+
+    @staticmethod
+    def _mapping(
+        lines: list[str], mapping: dict[str, Any], indent: str, lead: str = ""
+    ) -> None:
+        # lead replaces the indent of the first key
+        for key, value in mapping.items():
+            prefix = f"{lead or indent}{ClabYAMLWriter._scalar(key)}:"
+            ClabYAMLWriter._item(lines, prefix, value, indent)
+            lead = ""
+
+    @staticmethod
+    def _sequence(
+        lines: list[str], sequence: list[Any], indent: str, lead: str = ""
+    ) -> None:
+        # Dashes are offset by 2 below their key, lead replaces the first one
+        for value in sequence:
+            prefix = f"{lead or indent + '  '}-"
+            ClabYAMLWriter._item(lines, prefix, value, indent + "  ", inline=True)
+            lead = ""
+
+    @staticmethod
+    def _nodes(lines: list[str], nodes: list[ClabNode]) -> None:
+        if not nodes:
+            lines.append("  nodes: {}")
+            return
+        lines.append("  nodes:")
+        # Newest node first, as the ruamel dump inserted every node at the top
+        for node in reversed(nodes):
+            name = ClabYAMLWriter._scalar(node.name)
+            comment = ClabYAMLWriter._comment(node.comment)
+            if node.data:
+                lines.append(f"    {name}:{comment}")
+                ClabYAMLWriter._mapping(lines, node.data, "      ")
+            else:
+                lines.append(f"    {name}: {{}}{comment}")
+
+    @staticmethod
+    def _links(lines: list[str], links: list[ClabLink]) -> None:
+        if not links:
+            lines.append("  links: []")
+            return
+        lines.append("  links:")
+        for link in links:
+            ClabYAMLWriter._endpoints(lines, link, "    ")
+
+    @staticmethod
+    def _endpoints(lines: list[str], link: ClabLink, indent: str) -> None:
+        lines.append(f"{indent}- endpoints:")
+        lines.append(
+            f"{indent}    - {ClabYAMLWriter._scalar(link.endpoint_1)}"
+            f"{ClabYAMLWriter._comment(link.comment_1)}"
+        )
+        # ruamel aligns a second comment of the list to the first one
+        lines.append(
+            f"{indent}    - {ClabYAMLWriter._scalar(link.endpoint_2)}"
+            f"{ClabYAMLWriter._comment(link.comment_2, ' ' if link.comment_1 else '  ')}"
+        )
+
+    @staticmethod
+    def dump(
+        base: dict[str, Any],
+        nodes: list[ClabNode],
+        links: list[ClabLink],
+        start_comment: str | None = None,
+    ) -> str:
+        """Public Method to write a containerlab topology as YAML text.
+
+        base is the topology file without nodes and links, they are written
+        below its "topology" key.
+        """
+        lines: list[str] = []
+        if start_comment:
+            lines.append(f"# {start_comment}")
+        for key, value in base.items():
+            if key != "topology":
+                ClabYAMLWriter._mapping(lines, {key: value}, "")
+                continue
+            lines.append("topology:")
+            ClabYAMLWriter._mapping(
+                lines,
+                {k: v for k, v in value.items() if k not in ("nodes", "links")},
+                "  ",
+            )
+            ClabYAMLWriter._nodes(lines, nodes)
+            ClabYAMLWriter._links(lines, links)
+        lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def dump_manifest(
+        shards: dict[str, list[ClabNode]],
+        links: list[tuple[ClabLink, str, str]],
+    ) -> str:
+        """Public Method to write the manifest of a sharded topology as YAML text.
+
+        links are the links between two shards, each with the names of the
+        shards of its first and second endpoint.
+        """
+        lines = ["shards:"] if shards else ["shards: []"]
+        for shard, nodes in shards.items():
+            lines.append(f"  - name: {ClabYAMLWriter._scalar(shard)}")
+            lines.append("    nodes:")
+            for node in nodes:
+                lines.append(f"      - {ClabYAMLWriter._scalar(node.name)}")
+        lines.append("cross_shard_links:" if links else "cross_shard_links: []")
+        for link, shard_1, shard_2 in links:
+            ClabYAMLWriter._endpoints(lines, link, "  ")
+            lines.append("    shards:")
+            lines.append(f"      - {ClabYAMLWriter._scalar(shard_1)}")
+            lines.append(f"      - {ClabYAMLWriter._scalar(shard_2)}")
+        lines.append("")
+        return "\n".join(lines)
@@ -0,0 +1,44 @@
+from collections import defaultdict
+from typing import Generic, TypeVar
+
+"""
+Python Module with the in-memory topology graph shared by the topology transforms.
+
+- Device index by name and devices grouped by role.
+- Every link is stored once under its canonical endpoint pair.
+"""
+
+DeviceT = TypeVar("DeviceT")
+# (device name, interface name)
+Endpoint = tuple[str, str]
+
+
+def device_role(device_name: str) -> str:
+    # Remove the 2 digits at the end of the device name to get the role
+    return device_name[:-2]
+
+
+class TopologyGraph(Generic[DeviceT]):
+    """Devices and links of a topology, filled in a single pass over the devices."""
+
+    def __init__(self) -> None:
+        self.devices: dict[str, DeviceT] = {}
+        self.groups: dict[str, list[DeviceT]] = defaultdict(list)
+        # Canonical (sorted) endpoint pair -> endpoints as first reported
+        self.links: dict[tuple[Endpoint, Endpoint], tuple[Endpoint, Endpoint]] = {}
+
+    def add_device(self, name: str, device: DeviceT) -> None:
+        self.devices[name] = device
+        self.groups[device_role(name)].append(device)
+
+    def add_link(self, endpoint_1: Endpoint, endpoint_2: Endpoint) -> bool:
+        """Add a link as reported by endpoint_1, False if it is already known."""
+        key = (
+            (endpoint_1, endpoint_2)
+            if endpoint_1 <= endpoint_2
+            else (endpoint_2, endpoint_1)
+        )
+        if key in self.links:
+            return False
+        self.links[key] = (endpoint_1, endpoint_2)
+        return True
@@ -0,0 +1,144 @@
+from lxml import etree  # nosec B410
+from pydantic import BaseModel
+from typing import Any, Dict
+
+from .xmlexporter import NETCONF_NAMESPACE, FieldKind, FieldPlan, XMLModelConverter
+
+"""
+Python Module to generate Netconf edit-config deltas.
+
+- Takes the previous and the current Pydantic Base Model as Input.
+- Emits only the changed subtrees, marked with nc:operation.
+"""
+
+OPERATION = f"{{{NETCONF_NAMESPACE}}}operation"
+
+
+class XMLModelDiff:
+    """Class XMLModelDiff."""
+
+    @staticmethod
+    def _leafvalue(value: Any) -> str | None:
+        if not isinstance(value, BaseModel):
+            return None
+        return str(XMLModelConverter._renderrootmodels(value))
+
+    @staticmethod
+    def _listkey(entry: Any, index: int) -> Any:
+        # The first leaf of a pydantify list entry is the YANG list key
+        if isinstance(entry, BaseModel):
+            plan = XMLModelConverter._compileplan(type(entry))
+            if plan and plan[0].kind is FieldKind.LEAF:
+                return XMLModelDiff._leafvalue(getattr(entry, plan[0].name))
+        return index
+
+    @staticmethod
+    def _rendersubtree(
+        roottree: etree.Element,
+        fieldplan: FieldPlan,
+        model: BaseModel,
+        namespace: str,
+        operation: str,
+    ) -> None:
+        subroottree = XMLModelConverter._createsubelement(
+            roottree, fieldplan, namespace
+        )
+        subroottree.set(OPERATION, operation)
+        XMLModelConverter._renderingmodel(model, subroottree, fieldplan.namespace)
+
+    @staticmethod
+    def _deletesubtree(
+        roottree: etree.Element,
+        fieldplan: FieldPlan,
+        model: BaseModel | None,
+        namespace: str,
+    ) -> None:
+        subroottree = XMLModelConverter._createsubelement(
+            roottree, fieldplan, namespace
+        )
+        subroottree.set(OPERATION, "delete")
+        if isinstance(model, BaseModel) and fieldplan.kind is FieldKind.LIST:
+            # A list entry is addressed by its key leaf
+            keyplan = XMLModelConverter._compileplan(type(model))[0]
+            keytree = XMLModelConverter._createsubelement(
+                subroottree, keyplan, fieldplan.namespace
+            )
+            keytree.text = XMLModelDiff._leafvalue(getattr(model, keyplan.name))
+
+    @staticmethod
+    def _difflist(
+        roottree: etree.Element,
+        fieldplan: FieldPlan,
+        previous: list[Any],
+        current: list[Any],
+        namespace: str,
+    ) -> None:
+        previousentries: Dict[Any, Any] = {
+            XMLModelDiff._listkey(entry, index): entry
+            for index, entry in enumerate(previous)
+        }
+        for index, entry in enumerate(current):
+            previousentry = previousentries.pop(
+                XMLModelDiff._listkey(entry, index), None
+            )
+            if previousentry is None:
+                XMLModelDiff._rendersubtree(
+                    roottree, fieldplan, entry, namespace, "merge"
+                )
+            elif previousentry != entry:
+                XMLModelDiff._rendersubtree(
+                    roottree, fieldplan, entry, namespace, "replace"
+                )
+        for previousentry in previousentries.values():
+            XMLModelDiff._deletesubtree(roottree, fieldplan, previousentry, namespace)
+
+    @staticmethod
+    def _diffmodel(
+        previous: BaseModel,
+        current: BaseModel,
+        roottree: etree.Element,
+        namespace: str = "",
+    ) -> etree.Element:
+        for fieldplan in XMLModelConverter._compileplan(type(current)):
+            old = getattr(previous, fieldplan.name)
+            new = getattr(current, fieldplan.name)
+            if old == new:
+                continue
+            if fieldplan.kind is FieldKind.LIST:
+                XMLModelDiff._difflist(
+                    roottree, fieldplan, old or [], new or [], namespace
+                )
+                continue
+            if not isinstance(old, BaseModel) and not isinstance(new, BaseModel):
+                continue
+            if not isinstance(new, BaseModel):
+                XMLModelDiff._deletesubtree(roottree, fieldplan, None, namespace)
+            elif fieldplan.kind is FieldKind.LEAF or not isinstance(old, BaseModel):
+                XMLModelDiff._rendersubtree(
+                    roottree, fieldplan, new, namespace, "merge"
+                )
+            else:
+                subroottree = XMLModelConverter._createsubelement(
+                    roottree, fieldplan, namespace
+                )
+                XMLModelDiff._diffmodel(old, new, subroottree, fieldplan.namespace)
+                if not len(subroottree):
+                    roottree.remove(subroottree)
+        return roottree
+
+    @staticmethod
+    def to_edit_config(previous: BaseModel | None, current: BaseModel) -> etree.Element:
+        """Public Method to convert the changes between two Pydantic Models into Netconf XML.
+
+        Without a previous model the whole current model is merged.
+        """
+        root = etree.Element(
+            f"{{{NETCONF_NAMESPACE}}}config", nsmap={"nc": NETCONF_NAMESPACE}
+        )
+        if previous is None:
+            return XMLModelConverter._renderingmodel(current, root)
+        if type(previous) is not type(current):
+            raise ValueError(
+                f"Cannot diff '{type(previous).__name__}' against '{type(current).__name__}'."
+            )
+        return XMLModelDiff._diffmodel(previous, current, root)
@@ -1,7 +1,20 @@
 from lxml import etree  # nosec B410
 from pydantic import BaseModel, RootModel
+from collections import OrderedDict
+from copy import deepcopy
 from enum import Enum
-from typing import Dict, Any
+from types import NoneType, UnionType
+from typing import (
+    Dict,
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Iterator,
+    NamedTuple,
+    Union,
+    get_args,
+    get_origin,
+)
 
 """
 Python Module to generate Netconf confirm XML Exporter.
@@ -10,10 +23,89 @@ Python Module to generate Netconf confirm XML Exporter.
 - Based on OpenConfig YAML Files.
 """
 
+NETCONF_NAMESPACE = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+
+class FieldKind(Enum):
+    """How a model field is rendered into XML."""
+
+    LIST = "list"
+    CONTAINER = "container"
+    LEAF = "leaf"
+
+
+class FieldPlan(NamedTuple):
+    """Precompiled rendering information of a single model field."""
+
+    name: str
+    tag: str
+    namespace: str
+    kind: FieldKind
+    model: type[BaseModel] | None
+
+
+class XMLFragmentCache:
+    """LRU cache of rendered list entries.
+
+    Entries of the given model types are keyed on their JSON serialization,
+    so an unchanged entry is copied from the cache instead of being rendered
+    again.
+    """
+
+    def __init__(
+        self, modeltypes: tuple[type[BaseModel], ...], maxsize: int = 4096
+    ) -> None:
+        self.modeltypes = frozenset(modeltypes)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fragments: OrderedDict[
+            tuple[str, str, type[BaseModel], bytes], etree.Element
+        ] = OrderedDict()
+
+    def render(
+        self,
+        model: BaseModel,
+        roottree: etree.Element,
+        fieldplan: FieldPlan,
+        namespace: str,
+    ) -> None:
+        """Append the rendered list entry to roottree."""
+        # Generated defaults such as plain strings in place of leaf models
+        # serialize fine but warn, the key only has to tell entries apart
+        key = (
+            fieldplan.tag,
+            namespace,
+            type(model),
+            model.__pydantic_serializer__.to_json(model, warnings=False),
+        )
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self.hits += 1
+            self._fragments.move_to_end(key)
+            roottree.append(deepcopy(fragment))
+            return
+        self.misses += 1
+        subroottree = XMLModelConverter._createsubelement(
+            roottree, fieldplan, namespace
+        )
+        XMLModelConverter._renderingmodel(model, subroottree, fieldplan.namespace)
+        self._fragments[key] = deepcopy(subroottree)
+        if len(self._fragments) > self.maxsize:
+            self._fragments.popitem(last=False)
+
+    def clear(self) -> None:
+        self._fragments.clear()
+        self.hits = 0
+        self.misses = 0
+
 
 class XMLModelConverter:
     """Class XMLConverter."""
 
+    _plans: Dict[type[BaseModel], tuple[FieldPlan, ...]] = {}
+    _tagmaps: Dict[type[BaseModel], Dict[str, FieldPlan]] = {}
+
     @staticmethod
     def _formatmodelkeybyalias(modelkey: str) -> tuple[list[str], str]:
         modelkey_parts = modelkey.split(":", 2)
@@ -40,27 +132,83 @@ class XMLModelConverter:
         )
 
     @staticmethod
-    def _checkifnamespaceisintree(roottree: etree.Element, namespace: str) -> bool:
-        if "xmlns" in roottree.attrib and roottree.attrib["xmlns"] == namespace:
-            return True
-        if roottree.getparent() is not None:
-            return XMLModelConverter._checkifnamespaceisintree(
-                roottree.getparent(), namespace
+    def _withoutnone(annotation: Any) -> Any:
+        """Strip None from Optional[X] and X | None annotations."""
+        if get_origin(annotation) in (Union, UnionType):
+            members = [arg for arg in get_args(annotation) if arg is not NoneType]
+            if len(members) == 1:
+                return members[0]
+        return annotation
+
+    @staticmethod
+    def _fieldkind(annotation: Any) -> FieldKind:
+        annotation = XMLModelConverter._withoutnone(annotation)
+        if get_origin(annotation) is list:
+            return FieldKind.LIST
+        if isinstance(annotation, type) and issubclass(annotation, RootModel):
+            return FieldKind.LEAF
+        return FieldKind.CONTAINER
+
+    @staticmethod
+    def _fieldmodel(annotation: Any) -> type[BaseModel] | None:
+        annotation = XMLModelConverter._withoutnone(annotation)
+        if get_origin(annotation) is list:
+            annotation = XMLModelConverter._withoutnone(get_args(annotation)[0])
+        if (
+            isinstance(annotation, type)
+            and issubclass(annotation, BaseModel)
+            and not issubclass(annotation, RootModel)
+        ):
+            return annotation
+        return None
+
+    @staticmethod
+    def _compileplan(modelclass: type[BaseModel]) -> tuple[FieldPlan, ...]:
+        """Resolve tag, namespace and kind of every field of a model class once."""
+        plan = XMLModelConverter._plans.get(modelclass)
+        if plan is not None:
+            return plan
+        fieldplans = []
+        for modelkey, fieldinfo in modelclass.model_fields.items():
+            if fieldinfo.alias is None:
+                raise ValueError(f"Alias for model key '{modelkey}' cannot be None.")
+            namespacelist, keyvalue = XMLModelConverter._formatmodelkeybyalias(
+                fieldinfo.alias
+            )
+            fieldplans.append(
+                FieldPlan(
+                    name=modelkey,
+                    tag=keyvalue,
+                    namespace=XMLModelConverter._getnamespace(namespacelist),
+                    kind=XMLModelConverter._fieldkind(fieldinfo.annotation),
+                    model=XMLModelConverter._fieldmodel(fieldinfo.annotation),
+                )
             )
-        return False
+        plan = tuple(fieldplans)
+        XMLModelConverter._plans[modelclass] = plan
+        return plan
+
+    @staticmethod
+    def _compiletagmap(modelclass: type[BaseModel]) -> Dict[str, FieldPlan]:
+        """Map the XML tags of a model class to their field plans."""
+        tagmap = XMLModelConverter._tagmaps.get(modelclass)
+        if tagmap is None:
+            tagmap = {
+                fieldplan.tag: fieldplan
+                for fieldplan in XMLModelConverter._compileplan(modelclass)
+            }
+            XMLModelConverter._tagmaps[modelclass] = tagmap
+        return tagmap
 
     @staticmethod
     def _createsubelement(
-        roottree: etree.Element, model: BaseModel, modelkey: str
+        roottree: etree.Element, fieldplan: FieldPlan, namespace: str
     ) -> etree.Element:
-        alias = model.model_fields[modelkey].alias
-        if alias is None:
-            raise ValueError(f"Alias for model key '{modelkey}' cannot be None.")
-        namespacelist, keyvalue = XMLModelConverter._formatmodelkeybyalias(alias)
-        namespace = XMLModelConverter._getnamespace(namespacelist)
-        if not XMLModelConverter._checkifnamespaceisintree(roottree, namespace):
-            return etree.SubElement(roottree, keyvalue, attrib={"xmlns": namespace})
-        return etree.SubElement(roottree, keyvalue)
+        if fieldplan.namespace != namespace:
+            return etree.SubElement(
+                roottree, fieldplan.tag, attrib={"xmlns": fieldplan.namespace}
+            )
+        return etree.SubElement(roottree, fieldplan.tag)
 
     @staticmethod
     def _renderrootmodels(model: BaseModel) -> str | int | None:
@@ -75,84 +223,220 @@ class XMLModelConverter:
         return None
 
     @staticmethod
-    def _renderingmodel(model: BaseModel, roottree: etree.Element) -> etree.Element:
-        if isinstance(model, BaseModel):
-            for modelkey in model.model_fields:
-                if isinstance(model, RootModel):
-                    roottree.text = str(XMLModelConverter._renderrootmodels(model))
-                    continue
-                if isinstance(getattr(model, modelkey), list):
-                    for modelentry in getattr(model, modelkey):
-                        subroottree = XMLModelConverter._createsubelement(
-                            roottree, model, modelkey
-                        )
-                        XMLModelConverter._renderingmodel(modelentry, subroottree)
-                    continue
-                if isinstance(getattr(model, modelkey), BaseModel):
+    def _renderingmodel(
+        model: BaseModel,
+        roottree: etree.Element,
+        namespace: str = "",
+        fragments: XMLFragmentCache | None = None,
+    ) -> etree.Element:
+        """Render the model below roottree.
+
+        namespace is the default namespace in scope at roottree, an xmlns
+        attribute is only emitted when a field leaves that scope. List entries
+        of the types held by fragments are taken from that cache.
+        """
+        if isinstance(model, RootModel):
+            roottree.text = str(XMLModelConverter._renderrootmodels(model))
+            return roottree
+        if not isinstance(model, BaseModel):
+            return roottree
+        for fieldplan in XMLModelConverter._compileplan(type(model)):
+            value = getattr(model, fieldplan.name)
+            if value is None:
+                continue
+            if fieldplan.kind is FieldKind.LIST:
+                for modelentry in value:
+                    if (
+                        fragments is not None
+                        and type(modelentry) in fragments.modeltypes
+                    ):
+                        fragments.render(modelentry, roottree, fieldplan, namespace)
+                        continue
                     subroottree = XMLModelConverter._createsubelement(
-                        roottree, model, modelkey
+                        roottree, fieldplan, namespace
+                    )
+                    XMLModelConverter._renderingmodel(
+                        modelentry, subroottree, fieldplan.namespace, fragments
                     )
+            elif isinstance(value, BaseModel):
+                subroottree = XMLModelConverter._createsubelement(
+                    roottree, fieldplan, namespace
+                )
+                if fieldplan.kind is FieldKind.LEAF:
+                    subroottree.text = str(XMLModelConverter._renderrootmodels(value))
+                else:
                     XMLModelConverter._renderingmodel(
-                        getattr(model, modelkey), subroottree
+                        value, subroottree, fieldplan.namespace, fragments
                     )
         return roottree
 
     @staticmethod
-    def to_xml(model: BaseModel) -> etree.Element:
+    def to_xml(
+        model: BaseModel, fragments: XMLFragmentCache | None = None
+    ) -> etree.Element:
         """Public Method to convert Pydantic into Netconf XML."""
-        root = etree.Element("{urn:ietf:params:xml:ns:netconf:base:1.0}config")
-        return XMLModelConverter._renderingmodel(model, root)
+        root = etree.Element(
+            f"{{{NETCONF_NAMESPACE}}}config", nsmap={"nc": NETCONF_NAMESPACE}
+        )
+        return XMLModelConverter._renderingmodel(model, root, fragments=fragments)
+
+    @staticmethod
+    def _streamingelement(xmlwriter: Any, fieldplan: FieldPlan, namespace: str) -> Any:
+        if fieldplan.namespace != namespace:
+            return xmlwriter.element(
+                fieldplan.tag, attrib={"xmlns": fieldplan.namespace}
+            )
+        return xmlwriter.element(fieldplan.tag)
+
+    @staticmethod
+    def _streamingmodel(
+        model: BaseModel, xmlwriter: Any, namespace: str = ""
+    ) -> Iterator[None]:
+        """Write the model to an open lxml xmlfile, yields after every list entry."""
+        if isinstance(model, RootModel):
+            xmlwriter.write(str(XMLModelConverter._renderrootmodels(model)))
+            return
+        if not isinstance(model, BaseModel):
+            return
+        for fieldplan in XMLModelConverter._compileplan(type(model)):
+            value = getattr(model, fieldplan.name)
+            if value is None:
+                continue
+            if fieldplan.kind is FieldKind.LIST:
+                for modelentry in value:
+                    with XMLModelConverter._streamingelement(
+                        xmlwriter, fieldplan, namespace
+                    ):
+                        yield from XMLModelConverter._streamingmodel(
+                            modelentry, xmlwriter, fieldplan.namespace
+                        )
+                    yield
+            elif isinstance(value, BaseModel):
+                with XMLModelConverter._streamingelement(
+                    xmlwriter, fieldplan, namespace
+                ):
+                    yield from XMLModelConverter._streamingmodel(
+                        value, xmlwriter, fieldplan.namespace
+                    )
+
+    @staticmethod
+    def _streamingconfig(model: BaseModel, output: Any) -> Iterator[None]:
+        with etree.xmlfile(output, encoding="utf-8") as xmlwriter:
+            with xmlwriter.element(
+                f"{{{NETCONF_NAMESPACE}}}config", nsmap={"nc": NETCONF_NAMESPACE}
+            ):
+                for _ in XMLModelConverter._streamingmodel(model, xmlwriter):
+                    xmlwriter.flush()
+                    yield
 
     @staticmethod
-    def _to_dict(tree: etree.Element) -> Dict[str, Any]:
+    def write_xml(model: BaseModel, output: BinaryIO) -> None:
+        """Public Method to stream Pydantic as Netconf XML into a binary file.
+
+        Unlike to_xml no element tree is built, every list entry is written
+        to output as soon as it is rendered.
+        """
+        for _ in XMLModelConverter._streamingconfig(model, output):
+            pass
+
+    @staticmethod
+    async def iter_xml(
+        model: BaseModel, chunksize: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """Public Method to stream Pydantic as Netconf XML in chunks of bytes."""
+        chunks: list[bytes] = []
+        buffered = 0
+
+        class _ChunkWriter:
+            @staticmethod
+            def write(data: bytes) -> None:
+                nonlocal buffered
+                chunks.append(data)
+                buffered += len(data)
+
+        for _ in XMLModelConverter._streamingconfig(model, _ChunkWriter()):
+            if buffered >= chunksize:
+                yield b"".join(chunks)
+                chunks.clear()
+                buffered = 0
+        if chunks:
+            yield b"".join(chunks)
+
+    @staticmethod
+    def _to_dict(
+        events: Iterator[tuple[str, etree.Element]],
+        model: type[BaseModel],
+        clear: bool = False,
+    ) -> Dict[str, Any]:
+        """Build the field dict of model from start/end element events.
+
+        Elements above the first tag known to model (e.g. <rpc-reply>, <data>)
+        are descended into, unknown elements below it are skipped.
+        """
         result: Dict[str, Any] = {}
+        # Open elements mapped to a field: (element, fieldplan, field dict)
+        stack: list[tuple[etree.Element, FieldPlan, Dict[str, Any]]] = []
+        skipping = 0
 
-        # Iteriere über alle direkten Kinder
-        for child in tree:
-            name = child.tag.split("}", 1)[-1]  # Entferne Namespace
-            text = child.text.strip() if child.text else None
-
-            match name:
-                case "vlan-id":  # Optional: Namen anpassen
-                    name = "vlan_id"
-                case "GigabitEthernet":
-                    name = "gigabit_ethernet"
-                case "TenGigabitEthernet":
-                    name = "ten_gigabit_ethernet"
-                case "TwentyFiveGigE":
-                    name = "twenty_five_gig_e"
-                case "FortyGigabitEthernet":
-                    name = "forty_gigabit_ethernet"
-                case "switchport-config":
-                    name = "switchport_config"
-
-            # Wenn das Element Kinder hat, rufe _to_dict rekursiv auf
-            if len(child):
-                child_dict: Dict[str, Any] = XMLModelConverter._to_dict(child)
-
-                # Falls der Tag mehrfach vorkommt, speichere ihn in einer Liste
-                if name in result:
-                    if not isinstance(result[name], list):
-                        result[name] = [result[name]]
-                    result[name].append(child_dict)
-                else:
-                    result[name] = child_dict
-            else:
-                # Kein Kind, speichere Textinhalt
-
-                # Falls der Tag mehrfach vorkommt, speichere ihn in einer Liste
-                if name in result:
-                    if not isinstance(result[name], list):
-                        result[name] = [result[name]]
-                    result[name].append(text)
+        for event, element in events:
+            if event == "start":
+                if skipping:
+                    skipping += 1
+                    continue
+                if stack:
+                    modelclass = stack[-1][1].model
+                    if modelclass is None:
+                        skipping = 1
+                        continue
+                    tagmap = XMLModelConverter._compiletagmap(modelclass)
                 else:
-                    # Leeres Element: Speichere ein leeres Dictionary wenn kein Value
-                    result[name] = text if text else {}
+                    tagmap = XMLModelConverter._compiletagmap(model)
+                fieldplan = tagmap.get(element.tag.rpartition("}")[2])
+                if fieldplan is not None:
+                    stack.append((element, fieldplan, {}))
+                elif stack:
+                    skipping = 1
+                continue
 
+            if skipping:
+                skipping -= 1
+            elif stack and stack[-1][0] is element:
+                _, fieldplan, values = stack.pop()
+                parent = stack[-1][2] if stack else result
+                value: Any = values
+                if fieldplan.model is None:
+                    value = element.text.strip() if element.text else None
+                else:
+                    # An absent YANG list is an empty list
+                    for childplan in XMLModelConverter._compileplan(fieldplan.model):
+                        if childplan.kind is FieldKind.LIST:
+                            values.setdefault(childplan.name, [])
+                if value is not None and fieldplan.kind is FieldKind.LIST:
+                    parent.setdefault(fieldplan.name, []).append(value)
+                elif value is not None:
+                    parent[fieldplan.name] = value
+            if clear and not skipping:
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
         return result
 
     @staticmethod
     def to_basemodel(tree: etree.Element, model: BaseModel) -> BaseModel:
         """Public Method to convert Neconf XML into Pydantic Model."""
-        dict = XMLModelConverter._to_dict(tree.getroot())
+        events = etree.iterwalk(tree, events=("start", "end"))
+        dict = XMLModelConverter._to_dict(events, model)  # type: ignore[arg-type]
+        return model.model_validate(dict)
+
+    @staticmethod
+    def from_xml(source: Any, model: type[BaseModel]) -> BaseModel:
+        """Public Method to stream Neconf XML from a file into a Pydantic Model.
+
+        Elements are cleared as soon as they are converted, so large
+        get-config replies are loaded at bounded memory.
+        """
+        events = etree.iterparse(
+            source, events=("start", "end"), resolve_entities=False
+        )
+        dict = XMLModelConverter._to_dict(events, model, clear=True)
         return model.model_validate(dict)
@@ -15,7 +15,7 @@ class AccessLeaf(BaseModel):
     )
 
 
-class NameLeaf(RootModel[str]):
+class NameLeaf2(RootModel[str]):
     model_config = ConfigDict(
         populate_by_name=True,
         regex_engine="python-re",
@@ -24,7 +24,7 @@ class NameLeaf(RootModel[str]):
         str,
         Field(
             pattern="^(?=^(0|[1-9][0-9]*)(/(0|[1-9][0-9]*))*(\\.[0-9]*)?$).*$",
-            title="NameLeaf",
+            title="NameLeaf2",
         ),
     ]
 
@@ -95,7 +95,7 @@ class ModeContainer(BaseModel):
     trunk: Annotated[TrunkLeaf, Field(None, alias="Cisco-IOS-XE-switch:trunk")]
 
 
-class NativeContainer(BaseModel):
+class NativeContainer2(BaseModel):
     model_config = ConfigDict(
         populate_by_name=True,
     )
@@ -171,7 +171,7 @@ class SwitchportContainer(BaseModel):
     mode: Annotated[ModeContainer, Field(None, alias="Cisco-IOS-XE-switch:mode")]
     access: Annotated[AccessContainer, Field(None, alias="Cisco-IOS-XE-switch:access")]
     trunk: Annotated[TrunkContainer, Field(None, alias="Cisco-IOS-XE-switch:trunk")]
-    native: Annotated[NativeContainer, Field(None, alias="Cisco-IOS-XE-switch:native")]
+    native: Annotated[NativeContainer2, Field(None, alias="Cisco-IOS-XE-switch:native")]
 
 
 class SwitchportConfigContainer(BaseModel):
@@ -191,7 +191,7 @@ class InterfaceListEntry(BaseModel):
     model_config = ConfigDict(
         populate_by_name=True,
     )
-    name: Annotated[NameLeaf, Field(None, alias="Cisco-IOS-XE-native:name")]
+    name: Annotated[NameLeaf2, Field(None, alias="Cisco-IOS-XE-native:name")]
     switchport_config: Annotated[
         SwitchportConfigContainer,
         Field(None, alias="Cisco-IOS-XE-native:switchport-config"),
@@ -221,6 +221,24 @@ class InterfaceContainer(BaseModel):
         List[InterfaceListEntry],
         Field(alias="Cisco-IOS-XE-native:FortyGigabitEthernet"),
     ]
+    two_gigabit_ethernet: Annotated[
+        List[InterfaceListEntry],
+        Field(alias="Cisco-IOS-XE-native:TwoGigabitEthernet"),
+    ]
+    five_gigabit_ethernet: Annotated[
+        List[InterfaceListEntry],
+        Field(alias="Cisco-IOS-XE-native:FiveGigabitEthernet"),
+    ]
+    hundred_gig_e: Annotated[
+        List[InterfaceListEntry], Field(alias="Cisco-IOS-XE-native:HundredGigE")
+    ]
+    four_hundred_gig_e: Annotated[
+        List[InterfaceListEntry], Field(alias="Cisco-IOS-XE-native:FourHundredGigE")
+    ]
+    app_gigabit_ethernet: Annotated[
+        List[InterfaceListEntry],
+        Field(alias="Cisco-IOS-XE-native:AppGigabitEthernet"),
+    ]
 
 
 class NameLeaf(RootModel[str]):
@@ -233,87 +251,11 @@ class NameLeaf(RootModel[str]):
     """
 
 
-class NameLeaf2(RootModel[str]):
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    root: Annotated[str, Field(title="NameLeaf2")]
-    """
-    Interface VLAN name.
-    """
-
-
-class NameLeaf4(RootModel[str]):
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    root: str
-    """
-    The name of the interface.
-
-    A device MAY restrict the allowed values for this leaf,
-    possibly depending on the type of the interface.
-    For system-controlled interfaces, this leaf is the
-    device-specific name of the interface.  The 'config false'
-    list interfaces/interface[name]/state contains the currently
-    existing interfaces on the device.
-
-    If a client tries to create configuration for a
-    system-controlled interface that is not present in the
-    corresponding state list, the server MAY reject
-    the request if the implementation does not support
-    pre-provisioning of interfaces or if the name refers to
-    an interface that can never exist in the system.  A
-    NETCONF server MUST reply with an rpc-error with the
-    error-tag 'invalid-value' in this case.
-
-    The IETF model in RFC 7223 provides YANG features for the
-    following (i.e., pre-provisioning and arbitrary-names),
-    however they are omitted here:
-
-     If the device supports pre-provisioning of interface
-     configuration, the 'pre-provisioning' feature is
-     advertised.
-
-     If the device allows arbitrarily named user-controlled
-     interfaces, the 'arbitrary-names' feature is advertised.
-
-    When a configured user-controlled interface is created by
-    the system, it is instantiated with the same name in the
-    /interfaces/interface[name]/state list.
-    """
-
-
-class VlanIdType(RootModel[int]):
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    root: Annotated[int, Field(ge=1, le=4094)]
-    """
-    Type definition representing a single-tagged VLAN
-    """
-
-
 class EnumerationEnum(Enum):
     integer_0 = 0
     integer_1 = 1
 
 
-class EnumerationEnum2(Enum):
-    integer_0 = 0
-    integer_1 = 1
-
-
-class NameLeaf3(RootModel[NameLeaf4]):
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    root: NameLeaf4
-    """
-    References the configured name of the interface
-    """
-
-
 class StatusLeaf(RootModel[EnumerationEnum]):
     model_config = ConfigDict(
         populate_by_name=True,
@@ -324,48 +266,16 @@ class StatusLeaf(RootModel[EnumerationEnum]):
     """
 
 
-class StatusLeaf2(RootModel[EnumerationEnum2]):
+class VlanIdLeaf2(RootModel[int]):
     model_config = ConfigDict(
         populate_by_name=True,
     )
-    root: Annotated[EnumerationEnum2, Field(title="StatusLeaf2")]
-    """
-    Admin state of the VLAN
-    """
-
-
-class VlanIdLeaf2(RootModel[VlanIdType]):
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    root: VlanIdType
-    """
-    Interface VLAN id.
-    """
-
-
-class VlanIdLeaf3(RootModel[VlanIdType]):
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    root: Annotated[VlanIdType, Field(title="Vlan-idLeaf3")]
+    root: Annotated[int, Field(ge=1, le=4094)]
     """
     Interface VLAN id.
     """
 
 
-class BaseInterfaceRefType(RootModel[NameLeaf3]):
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    root: NameLeaf3
-    """
-    Reusable type for by-name reference to a base interface.
-    This type may be used in cases where ability to reference
-    a subinterface is not required.
-    """
-
-
 class ConfigContainer(BaseModel):
     """
     Configuration parameters for VLANs
@@ -379,73 +289,16 @@ class ConfigContainer(BaseModel):
     status: Annotated[StatusLeaf, Field("ACTIVE", alias="openconfig-vlan:status")]
 
 
-class InterfaceLeaf(RootModel[BaseInterfaceRefType]):
+class VlanIdLeaf(RootModel[int]):
     model_config = ConfigDict(
         populate_by_name=True,
     )
-    root: Annotated[BaseInterfaceRefType, Field(title="InterfaceLeaf")]
-    """
-    Reference to a base interface.
-    """
-
-
-class StateContainer(BaseModel):
-    """
-    State variables for VLANs
-    """
-
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    vlan_id: Annotated[VlanIdLeaf3, Field(None, alias="openconfig-vlan:vlan-id")]
-    name: Annotated[NameLeaf2, Field(None, alias="openconfig-vlan:name")]
-    status: Annotated[StatusLeaf2, Field("ACTIVE", alias="openconfig-vlan:status")]
-
-
-class StateContainer2(BaseModel):
-    """
-    Operational state for base interface reference
-    """
-
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    interface: Annotated[InterfaceLeaf, Field(None, alias="openconfig-vlan:interface")]
-
-
-class VlanIdLeaf(RootModel[VlanIdLeaf2]):
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    root: Annotated[VlanIdLeaf2, Field(title="Vlan-idLeaf")]
+    root: Annotated[int, Field(ge=1, le=4094, title="Vlan-idLeaf")]
     """
     references the configured vlan-id
     """
 
 
-class MemberListEntry(BaseModel):
-    """
-    List of references to interfaces / subinterfaces
-    associated with the VLAN.
-    """
-
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    state: Annotated[StateContainer2, Field(None, alias="openconfig-vlan:state")]
-
-
-class MembersContainer(BaseModel):
-    """
-    Enclosing container for list of member interfaces
-    """
-
-    model_config = ConfigDict(
-        populate_by_name=True,
-    )
-    member: Annotated[List[MemberListEntry], Field(alias="openconfig-vlan:member")]
-
-
 class VlanListEntry2(BaseModel):
     """
     Configured VLANs keyed by id
@@ -456,8 +309,6 @@ class VlanListEntry2(BaseModel):
     )
     vlan_id: Annotated[VlanIdLeaf, Field(None, alias="openconfig-vlan:vlan-id")]
     config: Annotated[ConfigContainer, Field(None, alias="openconfig-vlan:config")]
-    state: Annotated[StateContainer, Field(None, alias="openconfig-vlan:state")]
-    members: Annotated[MembersContainer, Field(None, alias="openconfig-vlan:members")]
 
 
 class VlansContainer(BaseModel):
@@ -1,9 +1,15 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterator
+from collections import defaultdict
+from copy import deepcopy
 
 from ruamel.yaml import YAML, CommentedMap, CommentedSeq
 from ruamel.yaml.compat import StringIO
 from infrahub_sdk.transforms import InfrahubTransform
 
+from .Modules.artifactcache import CachedTransformMixin
+from .Modules.clabwriter import ClabLink, ClabNode, ClabYAMLWriter
+from .Modules.topologygraph import TopologyGraph, device_role
+
 if TYPE_CHECKING:
     from custom_helper.protocols import (
         NetworkDevice,
@@ -22,39 +28,110 @@ CLAB_BASE_DATA = {
         "links": [],
     },
 }
+CLAB_SCHEMA_COMMENT = "yaml-language-server: $schema=https://github.com/srl-labs/containerlab/blob/main/schemas/clab.schema.json"
 
 
-class TransformContainerlabTopology(InfrahubTransform):
+class TransformContainerlabTopology(CachedTransformMixin, InfrahubTransform):
     query = "GetNetworkDevices"
-    processed_endpoints: list[str] = []
+    # YAML emission: "direct" writer or the ruamel round-trip "ruamel" dumper
+    yaml_emitter = "direct"
+    # Split the topology into one lab per device "role", or None for a single lab
+    shard_by: str | None = None
 
     async def transform(self, data):
         await self.fetch()
 
         devices: list[NetworkDevice] = self.nodes  # type: ignore
 
-        yaml = YAML()
-        yaml.indent(mapping=2, sequence=4, offset=2)
-
-        nodes = CommentedMap()
-        links: list[dict[str, CommentedSeq]] = []
+        graph: TopologyGraph[ClabNode] = TopologyGraph()
+        links: list[ClabLink] = []
 
         for device in devices:
-            # Add the device to the nodes map with description as a comment
-            nodes.insert(
-                0,
+            # The device description is written as a comment of its node
+            graph.add_device(
                 device.name.value,
-                CommentedMap(CLAB_KIND_DATA.get(device.platform.value)),
-                comment=device.description.value,
+                ClabNode(
+                    device.name.value,
+                    CLAB_KIND_DATA.get(device.platform.value) or {},
+                    device.description.value,
+                ),
+            )
+            links.extend(self.get_links(device, graph))
+
+        match self.shard_by:
+            case None:
+                return self.dump(CLAB_BASE_DATA, list(graph.devices.values()), links)
+            case "role":
+                return self.dump_shards(graph, links)
+            case _:
+                raise ValueError(f"Unknown shard key '{self.shard_by}'.")
+
+    def dump(
+        self, base: dict[str, Any], nodes: list[ClabNode], links: list[ClabLink]
+    ) -> str:
+        match self.yaml_emitter:
+            case "direct":
+                return ClabYAMLWriter.dump(base, nodes, links, CLAB_SCHEMA_COMMENT)
+            case "ruamel":
+                return self.dump_ruamel(base, nodes, links)
+            case _:
+                raise ValueError(f"Unknown YAML emitter '{self.yaml_emitter}'.")
+
+    def dump_shards(self, graph: TopologyGraph[ClabNode], links: list[ClabLink]) -> str:
+        """Render a manifest followed by one lab per role as YAML documents.
+
+        Links inside a role belong to its lab, the manifest lists the links
+        between two labs so they can be wired up between the lab hosts.
+        """
+        shardnodes = {
+            f"{CLAB_BASE_DATA['name']}-{role}": members
+            for role, members in graph.groups.items()
+        }
+
+        shardlinks: dict[str, list[ClabLink]] = defaultdict(list)
+        crosslinks: list[tuple[ClabLink, str, str]] = []
+        for link in links:
+            shard_1 = f"{CLAB_BASE_DATA['name']}-{device_role(link.node_1)}"
+            shard_2 = f"{CLAB_BASE_DATA['name']}-{device_role(link.node_2)}"
+            if shard_1 == shard_2 and shard_1 in shardnodes:
+                shardlinks[shard_1].append(link)
+            else:
+                crosslinks.append((link, shard_1, shard_2))
+
+        documents = [ClabYAMLWriter.dump_manifest(shardnodes, crosslinks)]
+        for shard, members in shardnodes.items():
+            documents.append(
+                self.dump({**CLAB_BASE_DATA, "name": shard}, members, shardlinks[shard])
             )
-            await self.get_endpoints(links, device)
+        return "---\n".join(documents)
+
+    @staticmethod
+    def dump_ruamel(
+        base: dict[str, Any], nodes: list[ClabNode], links: list[ClabLink]
+    ) -> str:
+        yaml = YAML()
+        yaml.indent(mapping=2, sequence=4, offset=2)
+
+        nodemap = CommentedMap()
+        for node in nodes:
+            # Add the device to the nodes map with description as a comment
+            nodemap.insert(0, node.name, CommentedMap(node.data), comment=node.comment)
+
+        endpoints: list[dict[str, CommentedSeq]] = []
+        for link in links:
+            interfaces = CommentedSeq()
+            interfaces.append(link.endpoint_1)
+            if link.comment_1:
+                interfaces.yaml_add_eol_comment(link.comment_1, 0)
+            interfaces.append(link.endpoint_2)
+            if link.comment_2:
+                interfaces.yaml_add_eol_comment(link.comment_2, 1)
+            endpoints.append({"endpoints": interfaces})
 
-        clab_topology = CommentedMap(CLAB_BASE_DATA)
-        clab_topology["topology"]["nodes"] = nodes
-        clab_topology["topology"]["links"] = links
-        clab_topology.yaml_set_start_comment(
-            "yaml-language-server: $schema=https://github.com/srl-labs/containerlab/blob/main/schemas/clab.schema.json"
-        )
+        clab_topology = CommentedMap(deepcopy(base))
+        clab_topology["topology"]["nodes"] = nodemap
+        clab_topology["topology"]["links"] = endpoints
+        clab_topology.yaml_set_start_comment(CLAB_SCHEMA_COMMENT)
 
         stream = StringIO()
         yaml.dump(clab_topology, stream)
@@ -68,39 +145,47 @@ class TransformContainerlabTopology(InfrahubTransform):
         # Asynchronous List Comprehensions
         [_ async for _ in batch.execute()]
 
-    @classmethod
-    async def get_endpoints(
-        cls, endpoints: list[dict[str, CommentedSeq]], device: "NetworkDevice"
-    ) -> None:
+    @staticmethod
+    def get_links(
+        device: "NetworkDevice", graph: TopologyGraph[ClabNode]
+    ) -> Iterator[ClabLink]:
         # await device.interfaces.fetch()
         for peer in device.interfaces.peers:
             interface: NetworkInterface = peer.peer  # type: ignore
 
             if not interface.remote_interface.id:
                 continue
-            endpoint_1 = f"{device.name.value}:{interface.name.value}"
-
-            if endpoint_1 in cls.processed_endpoints:
-                continue
-
             # await interface.remote_interface.fetch()
             remote_interface: NetworkInterface = interface.remote_interface.peer  # type: ignore
             # await remote_interface.device.fetch()
             remote_device: NetworkDevice = remote_interface.device.peer  # type: ignore
-            endpoint_2 = f"{remote_device.name.value}:{remote_interface.name.value}"
 
-            interfaces = CommentedSeq()
-            interfaces.append(endpoint_1)
-            if interface.ip_address.id:
-                interfaces.yaml_add_eol_comment(interface.ip_address.display_label, 0)
+            # Both ends of a link report it, keep the first one
+            if not graph.add_link(
+                (device.name.value, interface.name.value),
+                (remote_device.name.value, remote_interface.name.value),
+            ):
+                continue
 
-            interfaces.append(endpoint_2)
-            if remote_interface.ip_address.id:
-                interfaces.yaml_add_eol_comment(
-                    remote_interface.ip_address.display_label, 1
-                )
+            endpoint_1 = f"{device.name.value}:{interface.name.value}"
+            endpoint_2 = f"{remote_device.name.value}:{remote_interface.name.value}"
+            yield ClabLink(
+                endpoint_1,
+                (
+                    interface.ip_address.display_label
+                    if interface.ip_address.id
+                    else None
+                ),
+                endpoint_2,
+                (
+                    remote_interface.ip_address.display_label
+                    if remote_interface.ip_address.id
+                    else None
+                ),
+                device.name.value,
+                remote_device.name.value,
+            )
 
-            cls.processed_endpoints.extend([endpoint_1, endpoint_2])
 
-            endpoints.append({"endpoints": interfaces})
-        return
+class TransformContainerlabShardedTopology(TransformContainerlabTopology):
+    shard_by = "role"
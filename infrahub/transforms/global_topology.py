@@ -1,21 +1,28 @@
-from typing import Annotated, Any, Optional
+from typing import Annotated, Any, ClassVar, Optional
 
 import base64
+import hashlib
 import zlib
 import logging
-from collections import defaultdict
+from collections import OrderedDict
 
 import httpx
 from infrahub_sdk.transforms import InfrahubTransform
-from pydantic import BaseModel, AliasPath, Field, BeforeValidator
+from pydantic import BaseModel, AliasPath, Field, BeforeValidator, PrivateAttr
+from pydantic_core import to_json
 from jinja2 import Template
 
+from .Modules.artifactcache import CachedTransformMixin
+from .Modules.topologygraph import TopologyGraph, device_role
 
-# Remove the 2 digits at the end of the device name to get the role
-DeviceRole = Annotated[str, BeforeValidator(lambda x: x[:-2])]
+
+DeviceRole = Annotated[str, BeforeValidator(device_role)]
 
 log = logging.getLogger("infrahub.tasks")
 
+# Parsed topologies kept per worker process
+TOPOLOGY_MEMO_SIZE = 8
+
 
 class Neighbor(BaseModel):
     device_name: str = Field(
@@ -54,9 +61,52 @@ class Device(BaseModel):
 class Topology(BaseModel):
     devices: list[Device] = Field(validation_alias=AliasPath("NetworkDevice", "edges"))
 
+    _memo: ClassVar[OrderedDict[str, "Topology"]] = OrderedDict()
+    _graph: Optional[TopologyGraph[Device]] = PrivateAttr(None)
+
     def model_post_init(self, context: Any) -> None:
         self.devices = sorted(self.devices, key=lambda x: x.name.lower())
 
+    @classmethod
+    def from_response(cls, data: Any) -> "Topology":
+        """Parse a GetNetworkDevices response, reusing the Topology of an identical one.
+
+        The returned Topology is shared between transforms and must not be modified.
+        """
+        # The GraphQL response keeps the field order of the query, an unsorted
+        # serialization is a stable key and much cheaper than the validation
+        digest = hashlib.blake2b(
+            to_json(data, fallback=str), digest_size=16
+        ).hexdigest()
+        topology = cls._memo.get(digest)
+        if topology is not None:
+            cls._memo.move_to_end(digest)
+            return topology
+        topology = cls.model_validate(data)
+        cls._memo[digest] = topology
+        if len(cls._memo) > TOPOLOGY_MEMO_SIZE:
+            cls._memo.popitem(last=False)
+        return topology
+
+    def graph(self) -> TopologyGraph[Device]:
+        """Index the devices and collect every link once, in one pass."""
+        if self._graph is not None:
+            return self._graph
+        graph: TopologyGraph[Device] = TopologyGraph()
+        for device in self.devices:
+            graph.add_device(device.name, device)
+            for interface in device.interfaces:
+                if interface.neighbor:
+                    graph.add_link(
+                        (device.name, interface.name),
+                        (
+                            interface.neighbor.device_name,
+                            interface.neighbor.interface_name,
+                        ),
+                    )
+        self._graph = graph
+        return graph
+
 
 def _kroki_get_url(base_url: str, diagram: str):
     encoded_diagram = base64.urlsafe_b64encode(zlib.compress(diagram.encode(), 9))
@@ -80,11 +130,11 @@ def short_intface_name(name: str) -> str:
     return name
 
 
-class TransformTopologyMarkdown(InfrahubTransform):
+class TransformTopologyMarkdown(CachedTransformMixin, InfrahubTransform):
     query = "GetNetworkDevices"
 
     async def transform(self, data):
-        m = Topology.model_validate(data)
+        graph = Topology.from_response(data).graph()
 
         markdown = "\n".join(
             [
@@ -96,13 +146,13 @@ class TransformTopologyMarkdown(InfrahubTransform):
 ## Interfaces
 {chr(10).join([f"- {i.name} ({i.mode}) - {i.description or 'N/A'}" for i in x.interfaces])}
 """
-                for x in m.devices
+                for x in graph.devices.values()
             ]
         )
         return markdown
 
 
-class TransformTopologySVGGraphviz(InfrahubTransform):
+class TransformTopologySVGGraphviz(CachedTransformMixin, InfrahubTransform):
     query = "GetNetworkDevices"
     graphiz_template = """
 graph {
@@ -122,29 +172,11 @@ subgraph cluster_{{ role }} {
 """
 
     async def transform(self, data):
-        m = Topology.model_validate(data)
-
-        links = []
-        groups = defaultdict(list)
-
-        for device in m.devices:
-            for interface in device.interfaces:
-                if interface.neighbor:
-                    endpoints = [
-                        (device.name, interface.name),
-                        (
-                            interface.neighbor.device_name,
-                            interface.neighbor.interface_name,
-                        ),
-                    ]
-                    endpoints.sort()
-                    if endpoints not in links:
-                        links.append(endpoints)
-            groups[device.role].append(device)
+        graph = Topology.from_response(data).graph()
 
         graphiz = Template(self.graphiz_template).render(
-            groups=groups,
-            links=links,
+            groups=graph.groups,
+            links=list(graph.links),
         )
         try:
             async with httpx.AsyncClient() as client:
@@ -158,7 +190,7 @@ subgraph cluster_{{ role }} {
         return response.text
 
 
-class TransformTopologySVGD2(InfrahubTransform):
+class TransformTopologySVGD2(CachedTransformMixin, InfrahubTransform):
     query = "GetNetworkDevices"
     d2_template = """
 vars: {
@@ -222,28 +254,25 @@ title: |md
 """
 
     async def transform(self, data):
-        m = Topology.model_validate(data)
-
-        links = []
-        groups = defaultdict(list)
-
-        for device in m.devices:
-            for interface in device.interfaces:
-                if interface.neighbor:
-                    endpoints = [
-                        (device.name, short_intface_name(interface.name)),
-                        (
-                            interface.neighbor.device_name,
-                            short_intface_name(interface.neighbor.interface_name),
-                        ),
-                    ]
-                    endpoints.sort()
-                    if endpoints not in links:
-                        links.append(endpoints)
-            groups[device.role].append(device)
+        graph = Topology.from_response(data).graph()
+
+        # Short interface names may collapse links, dedupe them again
+        links = list(
+            dict.fromkeys(
+                tuple(
+                    sorted(
+                        [
+                            (device_1, short_intface_name(interface_1)),
+                            (device_2, short_intface_name(interface_2)),
+                        ]
+                    )
+                )
+                for (device_1, interface_1), (device_2, interface_2) in graph.links
+            )
+        )
 
         d2 = Template(self.d2_template).render(
-            groups=groups,
+            groups=graph.groups,
             links=links,
         )
         log.warning(_kroki_get_url("https://kroki.io/d2/svg/", d2))
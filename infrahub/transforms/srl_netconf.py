@@ -3,6 +3,8 @@ from typing import TYPE_CHECKING
 from infrahub_sdk.transforms import InfrahubTransform
 from custom_helper.srl_netconf import main
 
+from .Modules.artifactcache import CachedTransformMixin
+
 if TYPE_CHECKING:
     from custom_helper.protocols import (
         NetworkDevice,
@@ -10,8 +12,12 @@ if TYPE_CHECKING:
     )
 
 
-class TransformSRLNetconf(InfrahubTransform):
+class TransformSRLNetconf(CachedTransformMixin, InfrahubTransform):
     query = "GetInterfacefromDevice"
+    # Resolve relations returned by the query from the store instead of fetching them
+    hydrate_from_response = True
+    # Artifact serialization: "pretty" or "compact" JSON, or a list of path "updates"
+    output_format = "pretty"
 
     async def transform(self, data):
         device: NetworkDevice = self.nodes[0]
@@ -19,14 +25,22 @@ class TransformSRLNetconf(InfrahubTransform):
         # Fetch all needed relations
         await self.fetch(device)
 
-        return await main(device)
+        return await main(device, self.output_format)
 
     async def fetch(self, device: "NetworkDevice"):
+        # convert_query_response already put these nodes into the store
+        hydrated = (
+            {node.id for node in self.related_nodes}
+            if self.hydrate_from_response
+            else set()
+        )
+
         batch = await self.client.create_batch()
         for interface_relation in device.interfaces.peers:
             interface: "NetworkInterface" = interface_relation.peer
-            if interface.ip_address.id:
+            if interface.ip_address.id and interface.ip_address.id not in hydrated:
                 batch.add(task=interface.ip_address.fetch)
 
-        # Asynchronous List Comprehensions
-        [_ async for _ in batch.execute()]
+        if batch.num_tasks:
+            # Asynchronous List Comprehensions
+            [_ async for _ in batch.execute()]
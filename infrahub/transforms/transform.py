@@ -1,9 +1,13 @@
 from __future__ import annotations
-import xml.etree.ElementTree as ETree  # nosec B405
+import logging
 import re
-from .Modules.xmlexporter import XMLModelConverter
+from functools import lru_cache
+from lxml import etree  # nosec B410
+from .Modules.xmlexporter import XMLModelConverter, XMLFragmentCache
+from .Modules.xmldiff import XMLModelDiff
+from .Modules.artifactcache import CachedTransformMixin
 from infrahub_sdk.transforms import InfrahubTransform
-from xml.dom.minidom import parseString  # nosec B408
+from custom_helper.vlanset import VlanSet
 from .PydanticStructure.out import (
     InterfaceContainer,
     NativeContainer,
@@ -31,23 +35,131 @@ from typing import Any, Dict
 - Generate an Netconf Conform XML with the XMLExporter class.
 """
 
+# Identical in every interface entry, so they are validated once and shared.
+# Shared models must not be mutated.
+TRUNK_MODE = ModeContainer(trunk=TrunkLeaf())
+ACCESS_MODE = ModeContainer(access=AccessLeaf())
+NO_SWITCHPORT_CONFIG = SwitchportConfigContainer()
 
-class TransformIntoNetconf(InfrahubTransform):
+# Interface type prefix followed by the interface number, e.g. "TwentyFiveGigE1/0/1"
+INTERFACE_NAME = re.compile(r"([A-Za-z-]+)([0-9]+(?:/[0-9]+)*(?:\.[0-9]+)?)")
+
+# Interface type prefix -> InterfaceContainer field, taken from the model aliases
+INTERFACE_FIELDS = {
+    fieldinfo.alias.rsplit(":", 1)[-1]: fieldname
+    for fieldname, fieldinfo in InterfaceContainer.model_fields.items()
+    if fieldinfo.alias is not None
+}
+
+log = logging.getLogger("infrahub.tasks")
+
+
+@lru_cache(maxsize=4096)
+def classify_interface(interfacename: str) -> tuple[str, str] | None:
+    """Public Function to split an interface name into its InterfaceContainer field and number."""
+    match = INTERFACE_NAME.fullmatch(interfacename)
+    if match is None or match.group(1) not in INTERFACE_FIELDS:
+        return None
+    return INTERFACE_FIELDS[match.group(1)], match.group(2)
+
+
+class TransformIntoNetconf(CachedTransformMixin, InfrahubTransform):
     """Public Class which inherits from InfrahubTransform."""
 
     query = "GetInterfacefromDevice"
+    batch_query = "GetInterfacefromDevices"
+    # VLANs in the payload: "all" VLANs or only the ones the "device" interfaces reference
+    vlan_scope = "all"
+    # Artifact serialization: "pretty", "compact" or "c14n"
+    output_format = "pretty"
+    # Rendered interfaces and VLANs, shared by all runs of this worker process
+    fragments = XMLFragmentCache((InterfaceListEntry, VlanListEntry2))
+
+    def serialize(self, xmlcontent: etree.Element) -> str:
+        """Public Method to serialize the Netconf XML in a single pass."""
+        match self.output_format:
+            case "pretty":
+                etree.indent(xmlcontent, space="\t")
+                return (
+                    '<?xml version="1.0" ?>\n'
+                    + etree.tostring(xmlcontent, encoding="unicode")
+                    + "\n"
+                )
+            case "compact":
+                return etree.tostring(xmlcontent, encoding="unicode")
+            case "c14n":
+                return etree.tostring(xmlcontent, method="c14n").decode()
+            case _:
+                raise ValueError(f"Unknown output format '{self.output_format}'.")
 
     async def transform(self, data: Dict[str, Any]) -> str:
         """Public Method for a PythonTransformer to load data into an Netconf XML."""
+        return self.serialize(
+            XMLModelConverter.to_xml(self.build_model(data), self.fragments)
+        )
+
+    def delta(self, previous: Dict[str, Any], data: Dict[str, Any]) -> str:
+        """Public Method to load only the changes between two query results into an Netconf XML."""
+        return self.serialize(
+            XMLModelDiff.to_edit_config(
+                self.build_model(previous), self.build_model(data)
+            )
+        )
+
+    async def transform_batch(
+        self, devices: list[str], page_size: int = 100
+    ) -> Dict[str, str]:
+        """Public Method to load many devices into Netconf XMLs with one paginated query.
+
+        The VLAN list is fetched with the first page only and shared by all devices.
+        Called by infrahub/bootstrap/render_netconf_artifacts.py.
+        """
+        artifacts: Dict[str, str] = {}
+        vlanlist: list[VlanListEntry2] | None = None
+        offset = 0
+        while True:
+            response = await self.client.query_gql_query(
+                name=self.batch_query,
+                variables={
+                    "devices": devices,
+                    "offset": offset,
+                    "limit": page_size,
+                    "with_vlans": vlanlist is None and self.vlan_scope == "all",
+                },
+                branch_name=self.branch_name,
+            )
+            data = response.get("data") or response
+            if vlanlist is None and self.vlan_scope == "all":
+                vlanlist = self.build_vlans(data)
+            edges = data["NetworkDevice"]["edges"]
+            for device in edges:
+                artifacts[device["node"]["name"]["value"]] = self.serialize(
+                    XMLModelConverter.to_xml(
+                        self.build_device_model(
+                            device["node"],
+                            (
+                                vlanlist
+                                if vlanlist is not None
+                                else self.build_device_vlans(device["node"])
+                            ),
+                        ),
+                        self.fragments,
+                    )
+                )
+            offset += len(edges)
+            if len(edges) < page_size or offset >= data["NetworkDevice"]["count"]:
+                return artifacts
+
+    def build_model(self, data: Dict[str, Any]) -> Model:
+        """Public Method to load the query result into the Pydantic Model."""
+        device = data["NetworkDevice"]["edges"][0]["node"]
+        if self.vlan_scope == "device":
+            return self.build_device_model(device, self.build_device_vlans(device))
+        return self.build_device_model(device, self.build_vlans(data))
+
+    def build_vlans(self, data: Dict[str, Any]) -> list[VlanListEntry2]:
+        """Public Method to load the VLANs of the query result into the Pydantic Model."""
         vlanlist = []
-        gigabit_ethernet_interfacelist = []
-        ten_gigabit_ethernet_interfacelist = []
-        twenty_five_gigabit_ethernet_interfacelist = []
-        forty_gigabit_ethernet_interfacelist = []
-        pattern = r"(.*?)([0-9](?:/[0-9](?:/[0-9]([0-9])?)?)?)$"
-        ETree.register_namespace("nc", "urn:ietf:params:xml:ns:netconf:base:1.0")
-
-        # VLAN Model
         for vlan in data["NetworkVlan"]["edges"]:
             vlanname = vlan["node"]["name"]["value"]
             vlanid = vlan["node"]["vlan_id"]["value"]
@@ -55,32 +167,55 @@ class TransformIntoNetconf(InfrahubTransform):
                 vlan_id=vlanid, config=ConfigContainer(vlan_id=vlanid, name=vlanname)
             )
             vlanlist.append(vlanentry)
+        return vlanlist
+
+    def build_device_vlans(self, device: Dict[str, Any]) -> list[VlanListEntry2]:
+        """Public Method to load the VLANs referenced by the device interfaces into the Pydantic Model."""
+        vlans: Dict[int, str] = {}
+        for intf in device["interfaces"]["edges"]:
+            for vlan in intf["node"]["vlan"]["edges"]:
+                vlans[vlan["node"]["vlan_id"]["value"]] = vlan["node"]["name"]["value"]
+        return [
+            VlanListEntry2(
+                vlan_id=vlanid, config=ConfigContainer(vlan_id=vlanid, name=vlanname)
+            )
+            for vlanid, vlanname in sorted(vlans.items())
+        ]
+
+    def build_device_model(
+        self, device: Dict[str, Any], vlanlist: list[VlanListEntry2]
+    ) -> Model:
+        """Public Method to load a device node of the query result into the Pydantic Model."""
+        interfacelists: Dict[str, list[InterfaceListEntry]] = {
+            fieldname: [] for fieldname in INTERFACE_FIELDS.values()
+        }
 
         # Interface Model
-        for intf in data["NetworkDevice"]["edges"][0]["node"]["interfaces"]["edges"]:
-            match = re.match(pattern, intf["node"]["name"]["value"])
-            if not match:
-                continue  # Skip this interface if the name doesn't match the pattern
+        for intf in device["interfaces"]["edges"]:
+            classified = classify_interface(intf["node"]["name"]["value"])
+            if classified is None:
+                log.warning(
+                    f"Skipping interface '{intf['node']['name']['value']}': unknown interface type"
+                )
+                continue
 
-            interfacespeed = match.group(1)
-            interfacename = match.group(2)
-            trunkvlanidlist = []
+            interfacefield, interfacename = classified
 
             match intf["node"]["mode"]["value"]:
                 case "trunk":
-                    for trunkvlan in intf["node"]["vlan"]["edges"]:
-                        trunkvlanidlist.append(trunkvlan["node"]["vlan_id"]["value"])
+                    trunkvlans = VlanSet(
+                        trunkvlan["node"]["vlan_id"]["value"]
+                        for trunkvlan in intf["node"]["vlan"]["edges"]
+                    )
 
                     interfacelistentrys = InterfaceListEntry(
                         name=interfacename,
                         switchport_config=SwitchportConfigContainer(
                             switchport=SwitchportContainer(
-                                mode=ModeContainer(trunk=TrunkLeaf()),
+                                mode=TRUNK_MODE,
                                 trunk=TrunkContainer(
                                     allowed=AllowedContainer(
-                                        vlan=VlanContainer2(
-                                            vlans=",".join(map(str, trunkvlanidlist))
-                                        )
+                                        vlan=VlanContainer2(vlans=str(trunkvlans))
                                     )
                                 ),
                             )
@@ -92,7 +227,7 @@ class TransformIntoNetconf(InfrahubTransform):
                         name=interfacename,
                         switchport_config=SwitchportConfigContainer(
                             switchport=SwitchportContainer(
-                                mode=ModeContainer(access=AccessLeaf()),
+                                mode=ACCESS_MODE,
                                 access=AccessContainer(
                                     vlan=VlanContainer(
                                         vlan=intf["node"]["vlan"]["edges"][0]["node"][
@@ -107,32 +242,19 @@ class TransformIntoNetconf(InfrahubTransform):
                 case _:
                     interfacelistentrys = InterfaceListEntry(
                         name=interfacename,
-                        switchport_config=SwitchportConfigContainer(),
+                        switchport_config=NO_SWITCHPORT_CONFIG,
                     )
 
-            match interfacespeed:
-                case "GigabitEthernet":
-                    gigabit_ethernet_interfacelist.append(interfacelistentrys)
-                case "TenGigabitEthernet":
-                    ten_gigabit_ethernet_interfacelist.append(interfacelistentrys)
-                case "TwentyFiveGigE":
-                    twenty_five_gigabit_ethernet_interfacelist.append(
-                        interfacelistentrys
-                    )
-                case "FortyGigabitEthernet":
-                    forty_gigabit_ethernet_interfacelist.append(interfacelistentrys)
+            interfacelists[interfacefield].append(interfacelistentrys)
 
-        model = Model(
+        return Model(
             vlans=VlansContainer(vlan=vlanlist),
-            native=NativeContainer(
-                interface=InterfaceContainer(
-                    gigabit_ethernet=gigabit_ethernet_interfacelist,
-                    ten_gigabit_ethernet=ten_gigabit_ethernet_interfacelist,
-                    twenty_five_gig_e=twenty_five_gigabit_ethernet_interfacelist,
-                    forty_gigabit_ethernet=forty_gigabit_ethernet_interfacelist,
-                )
-            ),
+            native=NativeContainer(interface=InterfaceContainer(**interfacelists)),
         )
-        xmlcontent = XMLModelConverter.to_xml(model)
-        xml_string = ETree.tostring(xmlcontent, encoding="unicode")
-        return parseString(xml_string).toprettyxml()  # nosec B318
+
+
+class TransformIntoNetconfDeviceVlans(TransformIntoNetconf):
+    """Public Class which renders only the VLANs the device interfaces reference."""
+
+    query = "GetInterfacefromDeviceScoped"
+    vlan_scope = "device"
@@ -1,2 +1,29 @@
+from typing import TYPE_CHECKING, Any
+import importlib
+
+if TYPE_CHECKING:
+    from custom_helper.protocols import (
+        IpamIPAddress as IpamIPAddress,
+        NetworkDevice as NetworkDevice,
+        NetworkInterface as NetworkInterface,
+        NetworkVlan as NetworkVlan,
+        TopologyGlobal as TopologyGlobal,
+    )
+
+_SUBMODULES = ("fingerprint", "lazy", "protocols", "srl_netconf", "vlanset")
+
+
+def __getattr__(name: str) -> Any:
+    # Submodules and the generated protocol types are only imported on first
+    # access, `import custom_helper` alone stays cheap for every flow
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    if not name.startswith("_"):
+        protocols = importlib.import_module(f"{__name__}.protocols")
+        if hasattr(protocols, name):
+            return getattr(protocols, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
 def main() -> str:
     return "Hello from custom-helper!"
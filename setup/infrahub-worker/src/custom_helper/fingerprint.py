@@ -0,0 +1,109 @@
+from typing import Any, Iterator
+from dataclasses import dataclass, field
+import hashlib
+import json
+
+from pydantic import BaseModel, RootModel
+from pydantic_core import to_jsonable_python
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Merkle digest of a pydantic config tree.
+
+    Containers and lists carry the fingerprints of their children, keyed by
+    the field alias respectively by `[key]` for list entries. A list with a
+    repeated key is keyed by `[index]` instead.
+    """
+
+    digest: bytes
+    children: dict[str, "Fingerprint"] = field(default_factory=dict)
+
+    @property
+    def hexdigest(self) -> str:
+        return self.digest.hex()
+
+
+def _hash(kind: bytes, *parts: bytes) -> bytes:
+    h = hashlib.blake2b(kind, digest_size=16)
+    for part in parts:
+        h.update(len(part).to_bytes(4, "big"))
+        h.update(part)
+    return h.digest()
+
+
+def _leaf(value: Any) -> Fingerprint:
+    encoded = json.dumps(
+        to_jsonable_python(value), sort_keys=True, separators=(",", ":")
+    )
+    return Fingerprint(_hash(b"leaf", encoded.encode()))
+
+
+def _node(kind: bytes, children: dict[str, Fingerprint]) -> Fingerprint:
+    parts: list[bytes] = []
+    for name in sorted(children):
+        parts.append(name.encode())
+        parts.append(children[name].digest)
+    return Fingerprint(_hash(kind, *parts), children)
+
+
+def _list_key(entry: Any, index: int) -> str:
+    # The first field of a generated list entry is the YANG list key
+    if isinstance(entry, BaseModel) and not isinstance(entry, RootModel):
+        for name in type(entry).model_fields:
+            key = getattr(entry, name)
+            if key is not None:
+                return f"[{to_jsonable_python(key)}]"
+            break
+    return f"[{index}]"
+
+
+def _list_children(entries: list[Any]) -> dict[str, Fingerprint]:
+    keys = [_list_key(entry, index) for index, entry in enumerate(entries)]
+    if len(set(keys)) != len(keys):
+        # A repeated key would drop entries from the digest, positions are unique
+        keys = [f"[{index}]" for index in range(len(entries))]
+    return {key: fingerprint(entry) for key, entry in zip(keys, entries)}
+
+
+def fingerprint(value: Any) -> Fingerprint:
+    """Compute the Merkle fingerprint of a pydantic model.
+
+    Fields holding their default value are left out, like
+    `model_dump(exclude_defaults=True)` does, so a parsed running config
+    and an intended config hash the same.
+    """
+    if isinstance(value, RootModel) or not isinstance(value, (BaseModel, list)):
+        return _leaf(value)
+    if isinstance(value, list):
+        return _node(b"list", _list_children(value))
+
+    children: dict[str, Fingerprint] = {}
+    for name, field_info in type(value).model_fields.items():
+        child = getattr(value, name)
+        if child is None or (
+            not field_info.is_required()
+            and child == field_info.get_default(call_default_factory=True)
+        ):
+            continue
+        children[field_info.alias or name] = fingerprint(child)
+    return _node(b"container", children)
+
+
+def changed_paths(
+    previous: Fingerprint, current: Fingerprint, path: str = ""
+) -> Iterator[str]:
+    """Yield the paths of all subtrees which differ, descending only into changed ones."""
+    if previous.digest == current.digest:
+        return
+    if not previous.children or not current.children:
+        yield path or "/"
+        return
+    for name in sorted(previous.children.keys() | current.children.keys()):
+        old = previous.children.get(name)
+        new = current.children.get(name)
+        child_path = f"{path}{name}" if name.startswith("[") else f"{path}/{name}"
+        if old is None or new is None:
+            yield child_path
+        else:
+            yield from changed_paths(old, new, child_path)
@@ -1,9 +1,12 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator
 from collections import defaultdict
+from functools import lru_cache
+import json
 
-from pydantic import RootModel
-import pydantic_srlinux.models.interfaces as srl_if
-import pydantic_srlinux.models.network_instance as srl_ni
+from pydantic import BaseModel, RootModel
+
+from custom_helper.lazy import lazy_import
+from custom_helper.vlanset import VlanSet
 
 if TYPE_CHECKING:
     from ipaddress import IPv4Interface
@@ -13,6 +16,51 @@ if TYPE_CHECKING:
         NetworkVlan,
         RelatedNode,
     )
+    import pydantic_srlinux.models.interfaces as srl_if
+    import pydantic_srlinux.models.network_instance as srl_ni
+else:
+    # The generated SRL modules are large, only load them once a payload is built
+    srl_if = lazy_import("pydantic_srlinux.models.interfaces")
+    srl_ni = lazy_import("pydantic_srlinux.models.network_instance")
+
+
+# Subinterface shapes that do not depend on the interface. Each one is built
+# once per worker and referenced from every interface that uses it, so they
+# are read-only.
+@lru_cache(maxsize=None)
+def fabric_subinterface() -> "srl_if.SubinterfaceListEntry":
+    return srl_if.SubinterfaceListEntry(
+        index=0,
+        # admin_state=srl_if.EnumerationEnum.enable,
+        ipv6=srl_if.Ipv6Container(admin_state=srl_if.EnumerationEnum.enable),
+    )
+
+
+@lru_cache(maxsize=None)
+def access_subinterface() -> "srl_if.SubinterfaceListEntry":
+    return srl_if.SubinterfaceListEntry(
+        index=0,
+        # admin_state=srl_if.EnumerationEnum.enable,
+        vlan=srl_if.VlanContainer(
+            encap=srl_if.EncapContainer(untagged=srl_if.UntaggedContainer())
+        ),
+    )
+
+
+@lru_cache(maxsize=4096)
+def trunk_subinterface(vlan_number: int) -> "srl_if.SubinterfaceListEntry":
+    """Single-tagged subinterface of a VLAN, shared by every trunk carrying it."""
+    return srl_if.SubinterfaceListEntry(
+        index=vlan_number,
+        # admin_state=srl_if.EnumerationEnum.enable,
+        vlan=srl_if.VlanContainer(
+            encap=srl_if.EncapContainer(
+                single_tagged=srl_if.SingleTaggedContainer(
+                    vlan_id=srl_if.VlanIdType(vlan_number)
+                )
+            )
+        ),
+    )
 
 
 class SRLYangPayloadHelper:
@@ -33,11 +81,7 @@ class SRLYangPayloadHelper:
 
     @staticmethod
     def fabric_subinterface_payload() -> "srl_if.SubinterfaceListEntry":
-        return srl_if.SubinterfaceListEntry(
-            index=0,
-            # admin_state=srl_if.EnumerationEnum.enable,
-            ipv6=srl_if.Ipv6Container(admin_state=srl_if.EnumerationEnum.enable),
-        )
+        return fabric_subinterface()
 
     def access_subinterface_payload(
         self, vlan: "NetworkVlan", interface_name: str
@@ -45,13 +89,7 @@ class SRLYangPayloadHelper:
         # Add interface to the mac_vrf to be able to create the network-instance later
         self.mac_vrfs[vlan.vlan_id.value].append(f"{interface_name}.0")
 
-        return srl_if.SubinterfaceListEntry(
-            index=0,
-            # admin_state=srl_if.EnumerationEnum.enable,
-            vlan=srl_if.VlanContainer(
-                encap=srl_if.EncapContainer(untagged=srl_if.UntaggedContainer())
-            ),
-        )
+        return access_subinterface()
 
     def trunk_subinterface_payload(
         self,
@@ -59,26 +97,12 @@ class SRLYangPayloadHelper:
         interface_name: str,
     ) -> list["srl_if.SubinterfaceListEntry"]:
         subinterfaces: list["srl_if.SubinterfaceListEntry"] = []
-        for peer in vlans:
-            vlan: NetworkVlan = peer.peer  # type: ignore
-            vlan_number = vlan.vlan_id.value
-
+        vlanset = VlanSet(peer.peer.vlan_id.value for peer in vlans)  # type: ignore
+        for vlan_number in vlanset:
             # Add interface to the mac_vrf to be able to create the network-instance later
             self.mac_vrfs[vlan_number].append(f"{interface_name}.{vlan_number}")
 
-            subinterfaces.append(
-                srl_if.SubinterfaceListEntry(
-                    index=vlan_number,
-                    # admin_state=srl_if.EnumerationEnum.enable,
-                    vlan=srl_if.VlanContainer(
-                        encap=srl_if.EncapContainer(
-                            single_tagged=srl_if.SingleTaggedContainer(
-                                vlan_id=srl_if.VlanIdType(vlan_number)
-                            )
-                        )
-                    ),
-                )
-            )
+            subinterfaces.append(trunk_subinterface(vlan_number))
         return subinterfaces
 
     def interface_payload(
@@ -92,8 +116,12 @@ class SRLYangPayloadHelper:
         subinterfaces: list[srl_if.SubinterfaceListEntry] | None = None
         match interface.mode.value:
             case "routed":
+                # The address attribute is queried, the display_label is only
+                # there when the node was fetched on its own
                 subinterfaces = [
-                    self.routed_subinterface_payload(interface.ip_address.peer)
+                    self.routed_subinterface_payload(
+                        interface.ip_address.peer.address.value
+                    )
                 ]
             case "fabric":
                 subinterfaces = [self.fabric_subinterface_payload()]
@@ -133,28 +161,159 @@ class SRLYangPayloadHelper:
         return network_instances
 
 
-class PyloadData(RootModel[list[srl_if.Model | srl_ni.Model]]):
-    root: list[srl_if.Model | srl_ni.Model]
+@lru_cache(maxsize=None)
+def _payload_model() -> type[RootModel]:
+    class PyloadData(RootModel[list[srl_if.Model | srl_ni.Model]]):
+        root: list[srl_if.Model | srl_ni.Model]
+
+    return PyloadData
+
 
+def __getattr__(name: str) -> Any:
+    # PyloadData needs the SRL models, so it is created on first use
+    if name == "PyloadData":
+        return _payload_model()
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def _interface_models(
+    helper: SRLYangPayloadHelper, device: "NetworkDevice"
+) -> Iterator["srl_if.InterfaceListEntry"]:
+    for interface in device.interfaces.peers:
+        yield helper.interface_payload(interface.peer)
+
+
+def _iter_model_json(
+    modelclass: type[BaseModel], fieldname: str, entries: Iterable[BaseModel]
+) -> Iterator[str]:
+    """Yield the compact JSON of modelclass(fieldname=entries) entry by entry."""
+    entryiter = iter(entries)
+    entry = next(entryiter, None)
+    if entry is None:
+        yield modelclass(**{fieldname: []}).model_dump_json(
+            exclude_defaults=True, by_alias=True
+        )
+        return
+    alias = modelclass.model_fields[fieldname].alias or fieldname
+    yield f"{{{json.dumps(alias)}:["
+    yield entry.model_dump_json(exclude_defaults=True, by_alias=True)
+    for entry in entryiter:
+        yield ","
+        yield entry.model_dump_json(exclude_defaults=True, by_alias=True)
+    yield "]}"
+
+
+def _path_elem(
+    modelclass: type[BaseModel], fieldname: str, key: str, value: Any, origin: bool
+) -> str:
+    """gNMI path element of a list entry, e.g. interface[name=ethernet-1/1]."""
+    name = modelclass.model_fields[fieldname].alias or fieldname
+    if not origin:
+        name = name.rsplit(":", 1)[-1]
+    if isinstance(value, RootModel):
+        value = value.root
+    escaped = str(value).replace("\\", "\\\\").replace("]", "\\]")
+    return f"{name}[{key}={escaped}]"
+
+
+def iter_updates(device: "NetworkDevice") -> Iterator[tuple[str, dict[str, Any]]]:
+    """Flatten the SRL payload of a device into (path, value) updates.
+
+    There is one update per interface without its subinterfaces, one per
+    subinterface and one per mac-vrf network-instance, so every update can
+    be compared and set on its own.
+    """
+    helper = SRLYangPayloadHelper()
+    for interface in _interface_models(helper, device):
+        path = "/" + _path_elem(srl_if.Model, "interface", "name", interface.name, True)
+        value = interface.model_dump(
+            mode="json", exclude_defaults=True, by_alias=True, exclude={"subinterface"}
+        )
+        yield path, value
+        for subinterface in interface.subinterface or []:
+            subpath = _path_elem(
+                srl_if.InterfaceListEntry,
+                "subinterface",
+                "index",
+                subinterface.index,
+                False,
+            )
+            value = subinterface.model_dump(
+                mode="json", exclude_defaults=True, by_alias=True
+            )
+            yield f"{path}/{subpath}", value
+    for network_instance in helper.mac_vrf_payload():
+        path = "/" + _path_elem(
+            srl_ni.Model, "network_instance", "name", network_instance.name, True
+        )
+        value = network_instance.model_dump(
+            mode="json", exclude_defaults=True, by_alias=True
+        )
+        yield path, value
+
+
+async def main(device: "NetworkDevice", output_format: str = "pretty") -> str:
+    """Render the SRL payload of a device as "pretty" or "compact" JSON.
+
+    "updates" renders the (path, value) list of iter_updates instead.
+    """
+    if output_format == "updates":
+        return json.dumps(
+            [{"path": path, "val": value} for path, value in iter_updates(device)],
+            indent=2,
+        )
 
-async def main(device: "NetworkDevice") -> str:
     helper = SRLYangPayloadHelper()
 
     # Interfaces
-    interface_models: list[srl_if.InterfaceListEntry] = []
-    for interface in device.interfaces.peers:
-        interface_models.append(helper.interface_payload(interface.peer))
-    interface_model = srl_if.Model(interface=interface_models)
+    interface_model = srl_if.Model(interface=list(_interface_models(helper, device)))
 
     # Mac-Vrf
     network_instance_model = srl_ni.Model(network_instance=helper.mac_vrf_payload())
 
-    # return interface_model.model_dump_json(
-    #     exclude_defaults=True, by_alias=True, indent=2
-    # )
-    # return network_instance_model.model_dump_json(
-    #     exclude_defaults=True, by_alias=True, indent=2
-    # )
-    return PyloadData(root=[interface_model, network_instance_model]).model_dump_json(
-        exclude_defaults=True, by_alias=True, indent=2
-    )
+    payload = _payload_model()(root=[interface_model, network_instance_model])
+    match output_format:
+        case "pretty":
+            return payload.model_dump_json(
+                exclude_defaults=True, by_alias=True, indent=2
+            )
+        case "compact":
+            return payload.model_dump_json(exclude_defaults=True, by_alias=True)
+        case _:
+            raise ValueError(f"Unknown output format '{output_format}'.")
+
+
+async def iter_payload(
+    device: "NetworkDevice", chunksize: int = 64 * 1024
+) -> AsyncIterator[str]:
+    """Stream the compact SRL payload of a device in chunks of JSON text.
+
+    Every interface is serialized as soon as it is built and then dropped.
+    JSON fragments are buffered until chunksize characters are reached, so
+    chunksize=0 yields every fragment on its own, including the separators
+    and the list framing. The joined chunks equal main(device, "compact").
+    """
+    helper = SRLYangPayloadHelper()
+    chunks: list[str] = ["["]
+    buffered = 1
+
+    def fragments() -> Iterator[str]:
+        yield from _iter_model_json(
+            srl_if.Model, "interface", _interface_models(helper, device)
+        )
+        yield ","
+        # The mac-vrfs are known once every interface has been built
+        yield from _iter_model_json(
+            srl_ni.Model, "network_instance", helper.mac_vrf_payload()
+        )
+        yield "]"
+
+    for fragment in fragments():
+        chunks.append(fragment)
+        buffered += len(fragment)
+        if buffered >= chunksize:
+            yield "".join(chunks)
+            chunks.clear()
+            buffered = 0
+    if chunks:
+        yield "".join(chunks)
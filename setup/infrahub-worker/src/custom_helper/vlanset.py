@@ -0,0 +1,125 @@
+from typing import Iterable, Iterator
+
+VLAN_ID_SPACE = 4096
+
+
+def _bit(vlan: int) -> int:
+    if not 0 <= vlan < VLAN_ID_SPACE:
+        raise ValueError(f"VLAN id {vlan} is outside 0-{VLAN_ID_SPACE - 1}")
+    return 1 << vlan
+
+
+class VlanSet:
+    """Immutable set of VLAN ids stored as a 4096-bit bitmask.
+
+    Membership, union and intersection are single integer operations and
+    `str()` renders the compressed range notation used by trunk allowed
+    lists, e.g. `1-30,40,50-60`. Operators return a new set, so a VlanSet
+    can be used as a dict key or set member.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, vlans: Iterable[int] = ()) -> None:
+        bits = 0
+        for vlan in vlans:
+            bits |= _bit(vlan)
+        self._bits = bits
+
+    @classmethod
+    def from_bits(cls, bits: int) -> "VlanSet":
+        if bits < 0 or bits >> VLAN_ID_SPACE:
+            raise ValueError("VLAN bitmask is outside the 4096-bit range")
+        vlanset = cls.__new__(cls)
+        vlanset._bits = bits
+        return vlanset
+
+    @classmethod
+    def parse(cls, text: str) -> "VlanSet":
+        """Parse the range notation produced by `str()`, e.g. `1-30,40`."""
+        bits = 0
+        for part in text.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, _, end = part.partition("-")
+            first, last = int(start), int(end or start)
+            if first > last:
+                raise ValueError(f"Invalid VLAN range '{part}'")
+            bits |= (_bit(last) << 1) - _bit(first)
+        return cls.from_bits(bits)
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    def ranges(self) -> Iterator[tuple[int, int]]:
+        """Yield the inclusive (first, last) runs of consecutive VLAN ids."""
+        bits = self._bits
+        while bits:
+            first = (bits & -bits).bit_length() - 1
+            run = bits >> first
+            length = (run ^ (run + 1)).bit_length() - 1
+            yield first, first + length - 1
+            bits &= ~(((1 << length) - 1) << first)
+
+    def __contains__(self, vlan: object) -> bool:
+        return (
+            isinstance(vlan, int)
+            and 0 <= vlan < VLAN_ID_SPACE
+            and bool(self._bits >> vlan & 1)
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        for first, last in self.ranges():
+            yield from range(first, last + 1)
+
+    def __len__(self) -> int:
+        return self._bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return bool(self._bits)
+
+    def __or__(self, other: "VlanSet") -> "VlanSet":
+        if not isinstance(other, VlanSet):
+            return NotImplemented
+        return VlanSet.from_bits(self._bits | other._bits)
+
+    def __and__(self, other: "VlanSet") -> "VlanSet":
+        if not isinstance(other, VlanSet):
+            return NotImplemented
+        return VlanSet.from_bits(self._bits & other._bits)
+
+    def __sub__(self, other: "VlanSet") -> "VlanSet":
+        if not isinstance(other, VlanSet):
+            return NotImplemented
+        return VlanSet.from_bits(self._bits & ~other._bits)
+
+    def union(self, *others: "VlanSet") -> "VlanSet":
+        bits = self._bits
+        for other in others:
+            bits |= other._bits
+        return VlanSet.from_bits(bits)
+
+    def intersection(self, *others: "VlanSet") -> "VlanSet":
+        bits = self._bits
+        for other in others:
+            bits &= other._bits
+        return VlanSet.from_bits(bits)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VlanSet):
+            return NotImplemented
+        return self._bits == other._bits
+
+    def __hash__(self) -> int:
+        return hash(self._bits)
+
+    def __str__(self) -> str:
+        return ",".join(
+            str(first) if first == last else f"{first}-{last}"
+            for first, last in self.ranges()
+        )
+
+    def __repr__(self) -> str:
+        return f"VlanSet('{self}')"